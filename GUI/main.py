@@ -6,35 +6,28 @@ import traceback
 import asyncio
 from srtranslator.srt_file import SrtFile
 from srtranslator.ass_file import AssFile
-from srtranslator.translators.deepl_api import DeeplApi
-from srtranslator.translators.deepl_scrap import DeeplTranslator
-from srtranslator.translators.pydeeplx import PyDeepLX
-from srtranslator.translators.translatepy import TranslatePy
+from srtranslator.translators.registry import create_translator
 
 builtin_translators = [
     {
         "id": "deepl-scrap",
         "name": "DeepL Scraper",
         "description": "Web scraper with selenium. Opens Gecodriver (firefox) to translate chunks of 1500 lines",
-        "handler": DeeplTranslator,
     },
     # {
     #     "id": "deepl-api",
     #     "name": "DeepL API",
     #     "description": "Uses a paid DeepL subscription to translate the files",
-    #     "handler": DeeplApi,
     # },
     {
         "id": "translatepy",
         "name": "TranslatePy",
         "description": "Uses TranslatePy library to translate from DeepL REST free api",
-        "handler": TranslatePy,
     },
     {
         "id": "pydeeplx",
         "name": "PyDeepLX",
         "description": "Uses PyDeepLX library to translate from DeepL REST free api",
-        "handler": PyDeepLX,
     },
 ]
 
@@ -178,18 +171,11 @@ def destination_language_dropdown():
 
 
 def get_translator(translator_id: str):
-    translator = next(
-        (
-            translator
-            for translator in builtin_translators
-            if translator["id"] == translator_id
-        ),
-        {},
-    )
-
-    handler = translator.get("handler", None)
+    if not any(translator["id"] == translator_id for translator in builtin_translators):
+        return None
 
-    return handler() if handler is not None else None
+    # Imports only the dependencies of the selected translator
+    return create_translator(translator_id)
 
 
 class TranslationProgress(ft.Container):
@@ -239,14 +225,18 @@ class TranslationProgress(ft.Container):
         self.progress_bar.value = min(1, float(progress) / float(total))
         self.page.update()
 
-    def translate(self):
+    async def translate(self):
         if self.cancelled:
             return
 
         self.close_button.disabled = True
         self.page.update()
 
-        translator = get_translator(self.translator_id)
+        # Creating a translator may launch a browser, keep it out of the event loop
+        loop = asyncio.get_event_loop()
+        translator = await loop.run_in_executor(
+            None, get_translator, self.translator_id
+        )
         if translator is None:
             raise Exception("Translator is None")
 
@@ -258,7 +248,7 @@ class TranslationProgress(ft.Container):
             raise Exception("File type not supported")
 
         try:
-            sub.translate(translator, self.src_lang, self.dest_lang)
+            await sub.atranslate(translator, self.src_lang, self.dest_lang)
             sub.wrap_lines(self.wrap_limit)
 
             filename = os.path.splitext(self.filepath)
@@ -268,12 +258,13 @@ class TranslationProgress(ft.Container):
             traceback.print_exc()
             raise Exception("Error while translating")
 
-        translator.quit()
+        await loop.run_in_executor(None, translator.quit)
+
         self.close_button.disabled = False
         self.page.update()
 
 
-def handle_translation(
+async def handle_translation(
     page: ft.Page,
     path_field_input: ft.TextField,
     translator: str,
@@ -306,7 +297,7 @@ def handle_translation(
 
     for process in translations:
         try:
-            process.translate()
+            await process.translate()
         except:
             process.close_button.disabled = False
             process.progress_bar.value = 1
@@ -324,17 +315,18 @@ def main(page: ft.Page):
     translator_dropdown = translators_dropdown()
     source_lang_dropdown = source_language_dropdown()
     dest_lang_dropdown = destination_language_dropdown()
-    submit_button = ft.OutlinedButton(
-        "Translate",
-        on_click=lambda x: handle_translation(
+
+    async def submit(e):
+        await handle_translation(
             page,
             path_field,
             translator_dropdown.value,
             source_lang_dropdown.value,
             dest_lang_dropdown.value,
             wrap_limit.value,
-        ),
-    )
+        )
+
+    submit_button = ft.OutlinedButton("Translate", on_click=submit)
 
     page.overlay.extend([pick_files_dialog, pick_folder_dialog])
     page.add(
@@ -0,0 +1,145 @@
+"""Placeholders for ASS override tags on heavily typeset (fansub) files
+
+Compares the numbered placeholders of srtranslator.ass_tags with the previous "|"
+placeholders (tags split from the text, then popped back in order):
+
+- time to replace the tags of every event and to put them back
+- events with their tags in the wrong place when the translator drops a
+  placeholder, or writes a "|" of its own
+- time of a full AssFile translation with a mock translator
+
+Run it with: python benchmarks/ass_tags.py --events 20000 --tags 8
+"""
+import io
+import os
+import re
+import sys
+import time
+import random
+import argparse
+import tempfile
+import contextlib
+
+# Import srtranslator from this checkout, also when it is not installed
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from srtranslator import ass_tags
+from srtranslator.ass_file import AssFile
+
+from synthetic import MockTranslator, write_ass
+
+parser = argparse.ArgumentParser(description="Benchmark the ASS tag placeholders")
+parser.add_argument("--events", type=int, default=20000)
+parser.add_argument("--tags", type=int, default=8, help="Maximum tag blocks per event")
+parser.add_argument("--repeat", type=int, default=3)
+parser.add_argument(
+    "--noise",
+    type=float,
+    default=0.05,
+    help="Probability of the translator dropping a placeholder, or adding a |",
+)
+args = parser.parse_args()
+
+
+def legacy_protect(text: str):
+    tags = ["{" + i.split("}")[0] + "}" for i in text.split("{") if "}" in i]
+    return re.sub(r"{.*?}", r"|", text), tags
+
+
+def legacy_restore(text: str, tags) -> str:
+    tags = list(reversed(tags))
+    restored = ""
+    for i in text.split("|"):
+        try:
+            restored += i + tags.pop()
+        except IndexError:
+            restored += i
+    return restored
+
+
+def protect(text: str):
+    text, tags, leading = ass_tags.protect(text)
+    return text, (tags, leading)
+
+
+def restore(text: str, tags) -> str:
+    return ass_tags.restore(text, *tags)
+
+
+engines = {"legacy |": (legacy_protect, legacy_restore), "ass_tags": (protect, restore)}
+
+
+def best_of(func) -> float:
+    times = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def drop_placeholder(text: str, placeholder: re.Pattern, rng: random.Random) -> str:
+    matches = list(placeholder.finditer(text))
+    if not matches:
+        return text
+    match = rng.choice(matches)
+    return text[: match.start()] + text[match.end() :]
+
+
+def add_bar(text: str, placeholder: re.Pattern, rng: random.Random) -> str:
+    words = text.split(" ")
+    words.insert(rng.randrange(len(words) + 1), "|")
+    return " ".join(words)
+
+
+def misplaced(texts, protect, restore, placeholder, noise) -> int:
+    """Events whose tags are not before the same words, or not there at all"""
+    rng = random.Random(0)
+    wrong = 0
+    for text in texts:
+        protected, tags = protect(text)
+        if rng.random() < args.noise:
+            protected = noise(protected, placeholder, rng)
+        restored = restore(protected, tags)
+
+        before = [part.split(" ")[0] for part in re.split(r"{.*?}", text)[1:]]
+        after = [part.split(" ")[0] for part in re.split(r"{.*?}", restored)[1:]]
+        if re.findall(r"{.*?}", restored) != re.findall(r"{.*?}", text) or (
+            before != after
+        ):
+            wrong += 1
+    return wrong
+
+
+with tempfile.TemporaryDirectory() as folder:
+    filepath = os.path.join(folder, "fansub.ass")
+    write_ass(filepath, args.events, tags=args.tags)
+    with contextlib.redirect_stdout(io.StringIO()):
+        texts = [event.text for event in AssFile(filepath).subtitles.events]
+    n_tags = sum(len(re.findall(r"{.*?}", text)) for text in texts)
+    print(f"{len(texts)} events, {n_tags} tags\n")
+
+    print("Events with misplaced tags when the translator drops a placeholder or adds a |")
+    print(f"{'engine':<12}{'protect':>10}{'restore':>10}{'dropped':>10}{'added |':>10}")
+    for name, (protect_text, restore_text) in engines.items():
+        protected = [protect_text(text) for text in texts]
+        protect_time = best_of(lambda: [protect_text(text) for text in texts])
+        restore_time = best_of(
+            lambda: [restore_text(text.upper(), tags) for text, tags in protected]
+        )
+        placeholder = re.compile(r"\|") if name == "legacy |" else ass_tags.PLACEHOLDER
+        dropped = misplaced(
+            texts, protect_text, restore_text, placeholder, drop_placeholder
+        )
+        added = misplaced(texts, protect_text, restore_text, placeholder, add_bar)
+        print(
+            f"{name:<12}{protect_time * 1000:>8.1f}ms{restore_time * 1000:>8.1f}ms"
+            f"{dropped / len(texts):>10.1%}{added / len(texts):>10.1%}"
+        )
+
+    def translate():
+        with contextlib.redirect_stdout(io.StringIO()):
+            sub = AssFile(filepath, lambda total, progress: None)
+            sub.translate(MockTranslator(), "en", "es", journal=False)
+
+    print(f"\nAssFile.translate {best_of(translate):.2f}s (mock translator)")
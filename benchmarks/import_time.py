@@ -0,0 +1,76 @@
+"""Startup time of the library and the CLI, and a guard against eager backend imports
+
+Importing srtranslator (or running the CLI with --help) must not import any
+translator backend (selenium, deepl, translatepy...). Each one is imported by the
+translator registry only when selected. Exits with an error if a backend module
+gets imported or the startup is slower than --max-seconds.
+
+Run it with: python benchmarks/import_time.py
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+
+# Run from the checkout, so it is imported also when it is not installed
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BACKENDS = ["deepl", "selenium", "webdriverdownloader", "translatepy", "PyDeepLX", "fp"]
+
+IMPORT_LIBRARY = """
+import sys, json
+import srtranslator, srtranslator.ass_file, srtranslator.srt_stream
+import srtranslator.translators.registry
+print(json.dumps(sorted({name.split(".")[0] for name in sys.modules})))
+"""
+
+parser = argparse.ArgumentParser(description="Benchmark the import time")
+parser.add_argument("--repeat", type=int, default=5)
+parser.add_argument(
+    "--max-seconds",
+    type=float,
+    default=1.0,
+    help="Fail if the best startup is slower than this",
+)
+args = parser.parse_args()
+
+
+def best_time(command) -> float:
+    times = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL, cwd=ROOT)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+baseline = best_time([sys.executable, "-c", "pass"])
+library = best_time([sys.executable, "-c", IMPORT_LIBRARY])
+cli = best_time([sys.executable, "-m", "srtranslator", "--help"])
+
+print(f"Python startup             {baseline * 1000:8.1f} ms")
+print(f"import srtranslator        {(library - baseline) * 1000:8.1f} ms")
+print(f"python -m srtranslator -h  {(cli - baseline) * 1000:8.1f} ms")
+
+modules = json.loads(
+    subprocess.run(
+        [sys.executable, "-c", IMPORT_LIBRARY],
+        check=True,
+        capture_output=True,
+        cwd=ROOT,
+    ).stdout
+)
+eager = [backend for backend in BACKENDS if backend in modules]
+
+failed = False
+if eager:
+    print(f"Backends imported eagerly: {', '.join(eager)}")
+    failed = True
+for name, seconds in [("library", library), ("cli", cli)]:
+    if seconds - baseline > args.max_seconds:
+        print(f"Startup of the {name} is slower than {args.max_seconds}s")
+        failed = True
+
+sys.exit(1 if failed else 0)
@@ -0,0 +1,263 @@
+"""Local stand-in for the DeepL REST API and DeepLX, to load test translators offline
+
+Endpoints:
+    POST /v2/translate  DeepL API (form or JSON body, several "text")
+    POST /translate     DeepLX ({"text", "source_lang", "target_lang"})
+    GET  /stats         Requests served, faults injected and peak concurrency
+
+Translations are deterministic: every line becomes "[TARGET] line". Faults are
+random but seeded: 429 responses (with Retry-After), 503 errors and merged lines
+(two lines of a text joined in one, like DeepL sometimes does).
+
+Point a translator at it with server_url:
+    DeeplApi("any-key", server_url="http://127.0.0.1:8000")
+    PyDeepLX(server_url="http://127.0.0.1:8000")
+or from the CLI with --server-url.
+
+Run it with: python benchmarks/mock_server.py --port 8000 --latency 0.2 --rate-limit-rate 0.1
+"""
+import json
+import time
+import random
+import argparse
+import threading
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+from urllib.parse import parse_qs
+
+
+def pseudo_translate(text: str, target_language: str) -> str:
+    return "\n".join(
+        f"[{target_language.upper()}] {line}" if line.strip() else line
+        for line in text.split("\n")
+    )
+
+
+class MockServer:
+    """Mock translation server running on a background thread
+
+    Args:
+        host (str, optional): Defaults to "127.0.0.1".
+        port (int, optional): Defaults to 0 (any free port).
+        latency (float, optional): Seconds per request. Defaults to 0.
+        jitter (float, optional): Random seconds added to the latency. Defaults to 0.
+        error_rate (float, optional): Probability of a 503 response. Defaults to 0.
+        rate_limit_rate (float, optional): Probability of a 429 response. Defaults to 0.
+        merge_rate (float, optional): Probability of merging two lines of a text. Defaults to 0.
+        seed (int, optional): Seed of the faults. Defaults to 0.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0,
+        jitter: float = 0,
+        error_rate: float = 0,
+        rate_limit_rate: float = 0,
+        merge_rate: float = 0,
+        seed: int = 0,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.merge_rate = merge_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stats = {
+            "requests": 0,
+            "translated": 0,
+            "characters": 0,
+            "errors": 0,
+            "rate_limited": 0,
+            "merged": 0,
+            "concurrent": 0,
+            "max_concurrent": 0,
+        }
+
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        """Serve on a background thread. Returns the base URL"""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.url
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats)
+
+    def _count(self, key: str, value: int = 1) -> None:
+        with self._lock:
+            self._stats[key] += value
+
+    def _fault(self) -> Optional[int]:
+        """Status code of the fault to inject in this request, if any"""
+        with self._lock:
+            roll = self._random.random()
+            delay = self.latency + self._random.random() * self.jitter
+
+        time.sleep(delay)
+        if roll < self.rate_limit_rate:
+            self._count("rate_limited")
+            return 429
+        if roll < self.rate_limit_rate + self.error_rate:
+            self._count("errors")
+            return 503
+        return None
+
+    def _translate(self, texts: List[str], target_language: str) -> List[str]:
+        translations = []
+        for text in texts:
+            translation = pseudo_translate(text, target_language)
+            lines = translation.split("\n")
+            with self._lock:
+                merge = len(lines) > 1 and self._random.random() < self.merge_rate
+            if merge:
+                self._count("merged")
+                lines[0:2] = [" ".join(lines[0:2])]
+                translation = "\n".join(lines)
+
+            translations.append(translation)
+
+        self._count("translated", len(texts))
+        self._count("characters", sum(map(len, texts)))
+        return translations
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                if self.path == "/stats":
+                    self._reply(200, server.stats())
+                else:
+                    self._reply(404, {"message": "Not found"})
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                server._count("requests")
+                with server._lock:
+                    server._stats["concurrent"] += 1
+                    server._stats["max_concurrent"] = max(
+                        server._stats["max_concurrent"], server._stats["concurrent"]
+                    )
+
+                try:
+                    status = server._fault()
+                    if status == 429:
+                        self._reply(429, {"message": "Too many requests"}, retry=1)
+                    elif status is not None:
+                        self._reply(status, {"message": "Service unavailable"})
+                    elif self.path.startswith("/v2/translate"):
+                        self._deepl(body)
+                    elif self.path.startswith("/translate"):
+                        self._deeplx(body)
+                    else:
+                        self._reply(404, {"message": "Not found"})
+                finally:
+                    server._count("concurrent", -1)
+
+            def _deepl(self, body: bytes):
+                if "json" in self.headers.get("Content-Type", ""):
+                    params = json.loads(body or b"{}")
+                    texts = params.get("text", [])
+                    target = params.get("target_lang", "")
+                    source = params.get("source_lang")
+                else:
+                    params = parse_qs(body.decode("utf-8"))
+                    texts = params.get("text", [])
+                    target = params.get("target_lang", [""])[0]
+                    source = params.get("source_lang", [None])[0]
+
+                if isinstance(texts, str):
+                    texts = [texts]
+                if not texts or not target:
+                    self._reply(400, {"message": "Missing text or target_lang"})
+                    return
+
+                translations = server._translate(texts, target)
+                self._reply(
+                    200,
+                    {
+                        "translations": [
+                            {
+                                "detected_source_language": (source or "EN").upper(),
+                                "text": translation,
+                            }
+                            for translation in translations
+                        ]
+                    },
+                )
+
+            def _deeplx(self, body: bytes):
+                params = json.loads(body or b"{}")
+                if not params.get("text") or not params.get("target_lang"):
+                    self._reply(400, {"code": 400, "message": "Invalid request"})
+                    return
+
+                translation = server._translate(
+                    [params["text"]], params["target_lang"]
+                )[0]
+                self._reply(
+                    200,
+                    {
+                        "code": 200,
+                        "id": server.stats()["requests"],
+                        "data": translation,
+                        "alternatives": [],
+                    },
+                )
+
+            def _reply(self, status: int, payload: dict, retry: int = 0):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                if retry:
+                    self.send_header("Retry-After", str(retry))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mock DeepL API and DeepLX server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--jitter", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0)
+    parser.add_argument("--merge-rate", type=float, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    mock = MockServer(**vars(args))
+    print(f"Serving on {mock.url}")
+    try:
+        mock.serve_forever()
+    except KeyboardInterrupt:
+        print(f"Stats: {mock.stats()}")
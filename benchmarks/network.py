@@ -0,0 +1,86 @@
+"""Load test a network translator against the local mock server
+
+Starts benchmarks/mock_server.py on a free port, points the translator at it with
+server_url and translates a synthetic SRT file. Reports throughput and what the
+server saw: requests, injected faults and peak concurrency.
+
+Run it with: python benchmarks/network.py -t pydeeplx --events 2000 --workers 4 --rate-limit-rate 0.1
+"""
+import io
+import os
+import sys
+import time
+import argparse
+import tempfile
+import contextlib
+
+# Import srtranslator from this checkout, also when it is not installed
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from srtranslator import SrtFile
+from srtranslator.translators.rate_limiter import RateLimiter
+
+from mock_server import MockServer
+from synthetic import write_srt
+
+parser = argparse.ArgumentParser(description="Load test a translator offline")
+parser.add_argument(
+    "-t", "--translator", choices=["deepl-api", "pydeeplx"], default="deepl-api"
+)
+parser.add_argument("--events", type=int, default=2000)
+parser.add_argument("--workers", type=int, default=4)
+parser.add_argument("--latency", type=float, default=0.05)
+parser.add_argument("--jitter", type=float, default=0.05)
+parser.add_argument("--error-rate", type=float, default=0)
+parser.add_argument("--rate-limit-rate", type=float, default=0)
+parser.add_argument("--merge-rate", type=float, default=0)
+parser.add_argument(
+    "--rate",
+    type=float,
+    default=50,
+    help="Requests per second allowed by the pydeeplx rate limiter",
+)
+parser.add_argument("--burst", type=int, default=10)
+args = parser.parse_args()
+
+
+def create_translator(url: str):
+    if args.translator == "deepl-api":
+        from srtranslator.translators.deepl_api import DeeplApi
+
+        return DeeplApi("mock-key", server_url=url)
+
+    from srtranslator.translators.pydeeplx import PyDeepLX
+
+    return PyDeepLX(server_url=url, limiter=RateLimiter("mock", args.rate, args.burst))
+
+
+server = MockServer(
+    latency=args.latency,
+    jitter=args.jitter,
+    error_rate=args.error_rate,
+    rate_limit_rate=args.rate_limit_rate,
+    merge_rate=args.merge_rate,
+)
+url = server.start()
+translator = create_translator(url)
+
+with tempfile.TemporaryDirectory() as folder:
+    filepath = os.path.join(folder, "load.srt")
+    write_srt(filepath, args.events)
+    sub = SrtFile(filepath, lambda total, progress: None)
+    n_char = sum(len(subtitle.content) for subtitle in sub.subtitles)
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        sub.translate(translator, "en", "es", args.workers, journal=False)
+    elapsed = time.perf_counter() - start
+
+translator.quit()
+server.stop()
+
+print(
+    f"{args.translator}: {args.events} subtitles, {n_char} characters in "
+    f"{elapsed:.2f}s ({n_char / elapsed:.0f} char/s) with {args.workers} workers"
+)
+print(f"Server: {server.stats()}")
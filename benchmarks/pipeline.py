@@ -0,0 +1,190 @@
+"""Time each stage of SrtFile and AssFile on synthetic files, and a full translate
+
+Stages: load_from_file, _clean_subs_content, _get_next_chunk, wrap_lines, save
+and translate (with a mock translator, its latency and failure rate). Each result is
+the best of --repeat runs. Results are appended to --results with the current
+commit, and compared with the last run of --compare (or the previous run).
+
+Run it with: python benchmarks/pipeline.py --sizes 100 1000 10000 100000
+"""
+import io
+import os
+import sys
+import json
+import time
+import pyass
+import argparse
+import platform
+import tempfile
+import subprocess
+import contextlib
+
+# Import srtranslator from this checkout, also when it is not installed
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from srtranslator import SrtFile
+from srtranslator.ass_file import AssFile
+from srtranslator.srt_parser import read_srt
+from srtranslator.translators.base import TimeOutException
+
+from synthetic import MockTranslator, write_ass, write_srt
+
+parser = argparse.ArgumentParser(description="Benchmark the subtitle pipeline")
+parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+parser.add_argument(
+    "--formats", nargs="+", choices=["srt", "ass"], default=["srt", "ass"]
+)
+parser.add_argument("--repeat", type=int, default=3)
+parser.add_argument("--latency", type=float, default=0.001, help="Seconds per request")
+parser.add_argument("--failure-rate", type=float, default=0)
+parser.add_argument("--workers", type=int, default=1)
+parser.add_argument("--max-char", type=int, default=4500)
+parser.add_argument(
+    "--results",
+    default=os.path.join(os.path.dirname(__file__), "results", "pipeline.jsonl"),
+    help="File where results are appended",
+)
+parser.add_argument("--compare", metavar="COMMIT", help="Compare with this commit")
+args = parser.parse_args()
+
+classes = {"srt": SrtFile, "ass": AssFile}
+
+
+def quiet():
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def no_progress(total, progress):
+    pass
+
+
+def best_of(setup, stage) -> float:
+    """Best time of stage(setup()) in args.repeat runs, without timing setup"""
+    times = []
+    for _ in range(args.repeat):
+        with quiet():
+            value = setup()
+            start = time.perf_counter()
+            stage(value)
+            times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def parse_raw(file_format: str, filepath: str):
+    """Subtitles parsed but not cleaned"""
+    with open(filepath, "r", encoding="utf-8") as input_file:
+        if file_format == "srt":
+            return read_srt(input_file)
+        return pyass.load(input_file)
+
+
+def translate(sub) -> int:
+    """Translate, resuming after each translator failure. Returns the retries"""
+    translator = MockTranslator(
+        args.latency, args.failure_rate, args.max_char, max(args.workers, 1)
+    )
+    retries = 0
+    while True:
+        try:
+            sub.translate(translator, "en", "es", args.workers, journal=False)
+            return retries
+        except TimeOutException:
+            retries += 1
+
+
+def run(file_format: str, events: int, folder: str) -> dict:
+    cls = classes[file_format]
+    filepath = os.path.join(folder, f"{events}.{file_format}")
+    output = os.path.join(folder, f"{events}_es.{file_format}")
+    (write_srt if file_format == "srt" else write_ass)(filepath, events)
+
+    def load():
+        return cls(filepath, no_progress)
+
+    def load_from_file(sub):
+        with open(filepath, "r", encoding="utf-8") as input_file:
+            sub.load_from_file(input_file)
+
+    results = {
+        "load_from_file": best_of(load, load_from_file),
+        "_clean_subs_content": best_of(
+            lambda: (load(), parse_raw(file_format, filepath)),
+            lambda value: value[0]._clean_subs_content(value[1]),
+        ),
+        "_get_next_chunk": best_of(
+            load, lambda sub: list(sub._get_next_chunk(args.max_char))
+        ),
+        "wrap_lines": best_of(load, lambda sub: sub.wrap_lines()),
+        "save": best_of(load, lambda sub: sub.save(output)),
+    }
+
+    retries = []
+
+    def translate_stage(sub):
+        retries.append(translate(sub))
+
+    results["translate"] = best_of(load, translate_stage)
+    results["retries"] = max(retries)
+    return results
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            text=True,
+            stderr=subprocess.DEVNULL,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def load_previous() -> dict:
+    if not os.path.exists(args.results):
+        return {}
+
+    with open(args.results, "r", encoding="utf-8") as results_file:
+        records = [json.loads(line) for line in results_file if line.strip()]
+    if args.compare:
+        records = [r for r in records if r["commit"].startswith(args.compare)]
+    return records[-1] if records else {}
+
+
+record = {
+    "commit": git_commit(),
+    "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+    "python": platform.python_version(),
+    "args": {
+        key: value
+        for key, value in vars(args).items()
+        if key not in ("results", "compare")
+    },
+    "results": {},
+}
+previous = load_previous()
+if previous:
+    print(f"Comparing with {previous['commit']} ({previous['date']})")
+
+with tempfile.TemporaryDirectory() as folder:
+    for file_format in args.formats:
+        for events in args.sizes:
+            name = f"{file_format}-{events}"
+            results = run(file_format, events, folder)
+            record["results"][name] = results
+
+            old = previous.get("results", {}).get(name, {})
+            for stage, seconds in results.items():
+                if stage == "retries":
+                    continue
+                line = f"{name:>12} {stage:<20} {seconds * 1000:10.2f} ms"
+                if stage in old:
+                    line += f"  ({seconds / max(old[stage], 1e-9):.2f}x)"
+                print(line)
+            if results["retries"]:
+                print(f"{name:>12} {'retries':<20} {results['retries']:10}")
+            sys.stdout.flush()
+
+os.makedirs(os.path.dirname(os.path.abspath(args.results)), exist_ok=True)
+with open(args.results, "a", encoding="utf-8") as results_file:
+    results_file.write(json.dumps(record) + "\n")
+print(f"Results saved in {args.results}")
@@ -0,0 +1,119 @@
+"""srtranslator.srt_parser against srt.parse and srt.sort_and_reindex on large SRT files
+
+For each size, times reading a synthetic file already in order, the same file with
+its subtitles shuffled, and with some timestamp lines broken ("->" arrows): srt
+aborts on those, the fast reader skips them. Checks both give the same subtitles.
+
+Run it with: python benchmarks/srt_parser.py --sizes 10000 100000
+"""
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+import tempfile
+
+import srt
+
+# Import srtranslator from this checkout, also when it is not installed
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from srtranslator.srt_parser import read_srt
+
+from synthetic import write_srt
+
+parser = argparse.ArgumentParser(description="Benchmark the SRT reader")
+parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+parser.add_argument("--repeat", type=int, default=3)
+parser.add_argument(
+    "--malformed",
+    type=float,
+    default=0.01,
+    help="Fraction of subtitles with a broken timestamp line",
+)
+args = parser.parse_args()
+
+# The skipped blocks are expected here
+logging.getLogger("srtranslator.srt_parser").setLevel(logging.ERROR)
+
+
+def with_srt(filepath: str):
+    with open(filepath, "r", encoding="utf-8", errors="ignore") as input_file:
+        return list(srt.sort_and_reindex(srt.parse(input_file)))
+
+
+def with_srt_parser(filepath: str):
+    with open(filepath, "r", encoding="utf-8", errors="ignore") as input_file:
+        return read_srt(input_file)
+
+
+readers = {"srt": with_srt, "srt_parser": with_srt_parser}
+
+
+def best_of(func) -> float:
+    times = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def rewrite(filepath: str, output: str, shuffle: bool, malformed: float) -> None:
+    rng = random.Random(0)
+    with open(filepath, encoding="utf-8") as input_file:
+        blocks = input_file.read().split("\n\n")[:-1]
+    if shuffle:
+        rng.shuffle(blocks)
+    if malformed:
+        blocks = [
+            block.replace("-->", "->", 1) if rng.random() < malformed else block
+            for block in blocks
+        ]
+    with open(output, "w", encoding="utf-8") as output_file:
+        output_file.write("".join(block + "\n\n" for block in blocks))
+
+
+def same(first, second) -> bool:
+    return [(sub.start, sub.end, sub.content) for sub in first] == [
+        (sub.start, sub.end, sub.content) for sub in second
+    ]
+
+
+print(f"{'events':>8}{'file':>11}{'srt':>10}{'srt_parser':>12}{'speedup':>9}")
+with tempfile.TemporaryDirectory() as folder:
+    for size in args.sizes:
+        ordered = os.path.join(folder, f"{size}.srt")
+        write_srt(ordered, size)
+        files = {"ordered": ordered}
+        for name, shuffle, malformed in (
+            ("shuffled", True, 0),
+            ("malformed", False, args.malformed),
+        ):
+            files[name] = os.path.join(folder, f"{size}_{name}.srt")
+            rewrite(ordered, files[name], shuffle, malformed)
+
+        for name, filepath in files.items():
+            times = {}
+            for reader, read in readers.items():
+                try:
+                    times[reader] = best_of(lambda: read(filepath))
+                except srt.SRTParseError:
+                    times[reader] = None
+
+            if times["srt"] is None:
+                fast = with_srt_parser(filepath)
+                print(
+                    f"{size:>8}{name:>11}{'aborts':>10}"
+                    f"{times['srt_parser']:>11.3f}s"
+                    f"  {size - len(fast)} skipped"
+                )
+                continue
+
+            assert same(with_srt(filepath), with_srt_parser(filepath)), filepath
+            print(
+                f"{size:>8}{name:>11}{times['srt']:>9.3f}s"
+                f"{times['srt_parser']:>11.3f}s"
+                f"{times['srt'] / times['srt_parser']:>8.1f}x"
+            )
@@ -0,0 +1,113 @@
+"""Memory and garbage collection time of subtitles as objects and as SubtitleStore
+
+Loads --files synthetic files of --events subtitles each and keeps all of them in
+memory, as the objects SrtFile and AssFile use (srt.Subtitle, pyass.Event) and as
+compact stores. Reports the traced memory, the time of a full gc.collect() while
+they are alive, and the time to convert all of them to stores and back to files.
+
+Run it with: python benchmarks/store_memory.py --files 200 --events 1000
+"""
+import io
+import gc
+import os
+import sys
+import time
+import argparse
+import tempfile
+import contextlib
+import tracemalloc
+
+# Import srtranslator from this checkout, also when it is not installed
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from srtranslator import SrtFile
+from srtranslator.ass_file import AssFile
+
+from synthetic import write_ass, write_srt
+
+parser = argparse.ArgumentParser(description="Benchmark the subtitle store memory")
+parser.add_argument("--files", type=int, default=200)
+parser.add_argument("--events", type=int, default=1000)
+parser.add_argument(
+    "--formats", nargs="+", choices=["srt", "ass"], default=["srt", "ass"]
+)
+args = parser.parse_args()
+
+writers = {"srt": write_srt, "ass": write_ass}
+classes = {"srt": SrtFile, "ass": AssFile}
+
+
+def measure(build):
+    """Memory still used by what build() returns, and a gc.collect() with it alive"""
+    gc.collect()
+    tracemalloc.start()
+    value = build()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    gc.collect()
+    return value, memory, time.perf_counter() - start
+
+
+def best_time(func, repeat: int = 3) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+print(f"{args.files} files of {args.events} subtitles\n")
+print(f"{'':<12}{'memory':>10}{'per sub':>10}{'gc.collect':>12}")
+
+with tempfile.TemporaryDirectory() as folder:
+    for file_format in args.formats:
+        # Files with different seeds, so the text is not shared between them
+        filepaths = []
+        for seed in range(args.files):
+            filepath = os.path.join(folder, f"{seed}.{file_format}")
+            writers[file_format](filepath, args.events, seed=seed)
+            filepaths.append(filepath)
+
+        def load_objects():
+            # Only the subtitles are kept, as SrtFile and AssFile hold them
+            return [
+                classes[file_format](filepath, backup=False).subtitles
+                for filepath in filepaths
+            ]
+
+        def load_stores():
+            return [
+                classes[file_format](filepath, backup=False).to_store()
+                for filepath in filepaths
+            ]
+
+        rows = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            subtitles, memory, collect = measure(load_objects)
+            files = [
+                classes[file_format](filepath, backup=False) for filepath in filepaths
+            ]
+            to_store = best_time(lambda: [sub.to_store() for sub in files])
+            del files, subtitles
+            rows.append(("objects", memory, collect))
+
+            stores, memory, collect = measure(load_stores)
+            from_store = best_time(
+                lambda: [
+                    classes[file_format].from_store(filepath, store)
+                    for filepath, store in zip(filepaths, stores)
+                ]
+            )
+            rows.append(("store", memory, collect))
+            del stores
+
+        n_subs = args.files * args.events
+        for name, memory, collect in rows:
+            print(
+                f"{file_format + ' ' + name:<12}{memory / 2**20:>8.1f}MB"
+                f"{memory / n_subs:>9.0f}B{collect * 1000:>10.1f}ms"
+            )
+        print(f"{'':<12}to_store {to_store:.2f}s, from_store {from_store:.2f}s")
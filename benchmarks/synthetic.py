@@ -0,0 +1,139 @@
+"""Synthetic subtitle files and an in-process mock translator for the benchmarks"""
+import time
+import random
+import threading
+
+from srtranslator.translators.base import Translator, TimeOutException
+
+WORDS = (
+    "the of and to in is you that it he was for on are as with his they at be this "
+    "have from or one had by word but not what all were we when your can said there"
+).split()
+
+ASS_HEADER = """[Script Info]
+ScriptType: v4.00+
+PlayResX: 1920
+PlayResY: 1080
+
+[V4+ Styles]
+Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding
+Style: Default,Arial,48,&H00FFFFFF,&H000000FF,&H00000000,&H00000000,0,0,0,0,100,100,0,0,1,2,2,2,10,10,10,1
+
+[Events]
+Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+"""
+
+ASS_TAGS = [
+    r"{\i1}",
+    r"{\i0}",
+    r"{\b1}",
+    r"{\b0}",
+    r"{\an8}",
+    r"{\fs36}",
+    r"{\c&H00FFFF&}",
+    r"{\pos(960,1000)}",
+    r"{\fad(200,200)}",
+    r"{\k25}",
+    r"{\blur2\bord3\shad1}",
+]
+
+
+def sentence(rng: random.Random, min_words: int = 3, max_words: int = 12) -> str:
+    words = rng.choices(WORDS, k=rng.randint(min_words, max_words))
+    return " ".join(words).capitalize()
+
+
+def _timestamp(seconds: float, separator: str, decimals: int) -> str:
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    width = 3 + decimals
+    return f"{int(hours):02}:{int(minutes):02}:{seconds:0{width}.{decimals}f}".replace(
+        ".", separator
+    )
+
+
+def write_srt(filepath: str, events: int, seed: int = 0) -> None:
+    """SRT file with one or two lines per subtitle, some html tags and dialogs"""
+    rng = random.Random(seed)
+    with open(filepath, "w", encoding="utf-8") as output_file:
+        for index in range(events):
+            start = index * 2.5
+            kind = rng.random()
+            if kind < 0.15:
+                content = f"- {sentence(rng)}\n- {sentence(rng)}"
+            elif kind < 0.3:
+                content = f"<i>{sentence(rng)}</i>"
+            elif kind < 0.6:
+                content = f"{sentence(rng)}\n{sentence(rng)}"
+            else:
+                content = sentence(rng)
+
+            output_file.write(
+                f"{index + 1}\n"
+                f"{_timestamp(start, ',', 3)} --> {_timestamp(start + 2, ',', 3)}\n"
+                f"{content}\n\n"
+            )
+
+
+def write_ass(filepath: str, events: int, seed: int = 0, tags: int = 4) -> None:
+    """ASS file where every event has up to `tags` override blocks and some line breaks"""
+    rng = random.Random(seed)
+    with open(filepath, "w", encoding="utf-8") as output_file:
+        output_file.write(ASS_HEADER)
+        for index in range(events):
+            start = index * 2.5
+            parts = [sentence(rng, 1, 5) for _ in range(rng.randint(1, tags))]
+            text = ""
+            for part in parts:
+                text += "".join(rng.choices(ASS_TAGS, k=rng.randint(1, 3))) + part
+                text += r"\N" if rng.random() < 0.2 else " "
+
+            output_file.write(
+                f"Dialogue: 0,{_timestamp(start, '.', 2)},"
+                f"{_timestamp(start + 2, '.', 2)},Default,,0,0,0,,{text.strip()}\n"
+            )
+
+
+class MockTranslator(Translator):
+    """Upper cases the text after sleeping `latency` seconds per request
+
+    Args:
+        latency (float, optional): Seconds per request. Defaults to 0.
+        failure_rate (float, optional): Probability of raising TimeOutException. Defaults to 0.
+        max_char (int, optional): Defaults to 4500.
+        max_workers (int, optional): Defaults to 8.
+        seed (int, optional): Seed of the failures. Defaults to 0.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0,
+        failure_rate: float = 0,
+        max_char: int = 4500,
+        max_workers: int = 8,
+        seed: int = 0,
+    ) -> None:
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.max_char = max_char
+        self.max_workers = max_workers
+        self.requests = 0
+        self.failures = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def translate(
+        self, text: str, source_language: str, destination_language: str
+    ) -> str:
+        with self._lock:
+            self.requests += 1
+            failed = self._random.random() < self.failure_rate
+            if failed:
+                self.failures += 1
+
+        if self.latency:
+            time.sleep(self.latency)
+        if failed:
+            raise TimeOutException("Mock translator failure")
+
+        return text.upper()
@@ -0,0 +1,54 @@
+"""Time per chunk to write text in the browser, typing it vs inserting it with javascript
+
+Needs Firefox. Run it with: python benchmarks/text_input.py
+"""
+import os
+import sys
+import time
+import random
+import string
+
+# Import srtranslator from this checkout, also when it is not installed
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from srtranslator.translators.selenium_utils import create_driver, TextArea
+
+os.environ.setdefault("MOZ_HEADLESS", "1")
+
+PAGE = """data:text/html,
+<textarea id="textarea" rows="40" cols="80"></textarea>
+<div id="editable" contenteditable="true"></div>
+"""
+CHUNK_SIZE = 1500
+REPEAT = 3
+
+
+def random_chunk(size: int) -> str:
+    lines = []
+    while sum(len(line) + 1 for line in lines) < size:
+        words = ["".join(random.choices(string.ascii_lowercase, k=6)) for _ in range(6)]
+        lines.append(" ".join(words))
+    return "\n".join(lines)[:size]
+
+
+def time_write(text_area: TextArea, text: str, fast: bool) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        text_area.write(text, fast=fast)
+    return (time.perf_counter() - start) / REPEAT
+
+
+driver = create_driver()
+driver.get(PAGE)
+
+chunk = random_chunk(CHUNK_SIZE)
+for element_id in ["textarea", "editable"]:
+    text_area = TextArea(driver, "ID", element_id)
+    typed = time_write(text_area, chunk, fast=False)
+    inserted = time_write(text_area, chunk, fast=True)
+    print(
+        f"{element_id}: {len(chunk)} characters per chunk, "
+        f"typing {typed:.3f}s, javascript {inserted:.3f}s ({typed / inserted:.0f}x)"
+    )
+
+driver.quit()
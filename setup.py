@@ -10,7 +10,7 @@ setup(
     long_description=Path("README.md").read_text(encoding="utf-8"),
     long_description_content_type="text/markdown",
     url="https://github.com/sinedie/SRTranslator",
-    version="0.3.9",
+    version="0.4.0",
     author="EAR",
     author_email="sinedie@protonmail.com",
     license="FREE",
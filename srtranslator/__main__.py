@@ -1,105 +1,38 @@
 import os
-import argparse
+import sys
+import time
+import queue
+import inspect
 import logging
+import threading
 import traceback
 
+from concurrent.futures import ThreadPoolExecutor
+
 from .srt_file import SrtFile
 from .ass_file import AssFile
-from .translators.deepl_api import DeeplApi
-from .translators.deepl_scrap import DeeplTranslator
-from .translators.translatepy import TranslatePy
-from .translators.pydeeplx import PyDeepLX
-
-parser = argparse.ArgumentParser(description="Translate an .STR and .ASS file")
-
-parser.add_argument(
-    "filepath",
-    metavar="path",
-    type=str,
-    help="File to translate",
-)
-
-parser.add_argument(
-    "-i",
-    "--src-lang",
-    type=str,
-    default="auto",
-    help="Source language. Default: auto",
-)
-
-parser.add_argument(
-    "-o",
-    "--dest-lang",
-    type=str,
-    default="es",
-    help="Destination language. Default: es (spanish)",
-)
-
-parser.add_argument(
-    "-v",
-    "--verbose",
-    action="store_const",
-    dest="loglevel",
-    const=logging.INFO,
-    help="Increase output verbosity",
-)
-
-parser.add_argument(
-    "-vv",
-    "--debug",
-    action="store_const",
-    dest="loglevel",
-    const=logging.DEBUG,
-    default=logging.WARNING,
-    help="Increase output verbosity for debugging",
-)
-
-parser.add_argument(
-    "-s",
-    "--show-browser",
-    action="store_true",
-    help="Show browser window",
-)
-
-parser.add_argument(
-    "-w",
-    "--wrap-limit",
-    type=int,
-    default=50,
-    help="Number of characters -including spaces- to wrap a line of text. Default: 50",
-)
-
-parser.add_argument(
-    "-t",
-    "--translator",
-    type=str,
-    choices=["deepl-scrap", "translatepy", "deepl-api", "pydeeplx"],
-    help="Built-in translator to use",
-    default="deepl-scrap",
-)
-
-parser.add_argument(
-    "--auth",
-    type=str,
-    help="Api key if needed on translator",
-)
-
-parser.add_argument(
-    "--proxies",
-    action="store_true",
-    help="Use proxy by default for pydeeplx",
-)
-
-builtin_translators = {
-    "deepl-scrap": DeeplTranslator,
-    "deepl-api": DeeplApi,
-    "translatepy": TranslatePy,
-    "pydeeplx": PyDeepLX,
-}
+from .srt_stream import SrtStream
+from .languages import output_path
+from . import events
+from .cli import parse_args
+from .profiling import Profiler
+from .translation_memory import TranslationMemory
+from .util import find_subtitle_files, show_progress
+from .translators.hedged import HedgedTranslator
+from .translators.registry import get_translator_class
 
-args = parser.parse_args()
+args = parse_args()
 logging.basicConfig(level=args.loglevel)
 
+# Only the selected translator (and its dependencies) is imported
+try:
+    translator_classes = [
+        get_translator_class(name) for name in [args.translator, *args.fallback]
+    ]
+except ImportError as e:
+    print(e)
+    sys.exit(1)
+
 try:
     os.environ.pop("MOZ_HEADLESS")
 except:
@@ -113,21 +46,224 @@ if args.auth:
     translator_args["api_key"] = args.auth
 if args.proxies:
     translator_args["proxies"] = args.proxies    
+if args.server_url:
+    translator_args["server_url"] = args.server_url
+if "deepl-scrap-pool" in [args.translator, *args.fallback]:
+    translator_args["size"] = args.browsers
 
-translator = builtin_translators[args.translator](**translator_args)
 
-try:
-    sub = AssFile(args.filepath)
-except AttributeError:
-    print("... Exception while loading as ASS try as SRT")
-    sub = SrtFile(args.filepath)
+def create_translator():
+    if not args.fallback:
+        return translator_classes[0](**translator_args)
 
-try:
-    sub.translate(translator, args.src_lang, args.dest_lang)
-    sub.wrap_lines(args.wrap_limit)
-    sub.save(f"{os.path.splitext(args.filepath)[0]}_{args.dest_lang}{os.path.splitext(args.filepath)[1]}")
-except:
-    sub.save_backup()
-    traceback.print_exc()
+    # Each translator gets only the options it takes
+    backends = []
+    for translator_class in translator_classes:
+        parameters = inspect.signature(translator_class).parameters
+        backends.append(
+            translator_class(
+                **{
+                    name: value
+                    for name, value in translator_args.items()
+                    if name in parameters
+                }
+            )
+        )
+    return HedgedTranslator(backends, percentile=args.hedge_percentile)
+
+
+translation_memory = TranslationMemory(args.memory) if args.memory else None
+
+sinks = []
+if args.events:
+    sinks.append(events.JsonLinesSink(args.events))
+if args.metrics:
+    sinks.append(events.PrometheusSink(args.metrics))
+for sink in sinks:
+    events.add_sink(sink)
+
+profiler = None
+if (
+    args.profile
+    or args.profile_cpu
+    or args.profile_memory
+    or args.profile_output
+    or args.profile_compare
+):
+    profiler = Profiler(cpu=args.profile_cpu, memory=args.profile_memory)
+    profiler.start()
+
+
+def load_file(filepath: str, progress_callback):
+    try:
+        return AssFile(filepath, progress_callback)
+    except AttributeError:
+        print("... Exception while loading as ASS try as SRT")
+        return SrtFile(filepath, progress_callback)
+
+
+# Files loaded for several languages, shared until their last language starts
+loaded = {}
+loaded_lock = threading.Lock()
+
+
+def load_for_language(filepath: str, destination_language: str, progress_callback):
+    """Load a file to translate, parsing and cleaning it once for all languages"""
+    if len(args.dest_lang) == 1:
+        return load_file(filepath, progress_callback)
+
+    with loaded_lock:
+        entry = loaded.setdefault(
+            filepath,
+            {"lock": threading.Lock(), "store": None, "left": len(args.dest_lang)},
+        )
+
+    try:
+        with entry["lock"]:
+            if entry["store"] is None:
+                # Kept as a compact store while its languages wait for a translator
+                sub = load_file(filepath, progress_callback)
+                entry["class"], entry["store"] = type(sub), sub.to_store()
+        return entry["class"].from_store(filepath, entry["store"], progress_callback)
+    finally:
+        with loaded_lock:
+            entry["left"] -= 1
+            # Every language has its copy, free it
+            if entry["left"] == 0:
+                del loaded[filepath]
+
+
+def translate_file(
+    filepath: str, destination_language: str, translator, progress_callback
+) -> int:
+    """Translate a file and save it next to it. Returns the number of characters translated"""
+    if args.stream and os.path.splitext(filepath)[1].lower() == ".srt":
+        return SrtStream(filepath, progress_callback).translate(
+            translator,
+            args.src_lang,
+            destination_language,
+            output_path(filepath, destination_language),
+            args.workers,
+            args.wrap_limit,
+        )
+
+    sub = load_for_language(filepath, destination_language, progress_callback)
+    if isinstance(sub, AssFile):
+        texts = [event.text for event in sub.subtitles.events]
+    else:
+        texts = [subtitle.content for subtitle in sub.subtitles]
+    n_char = sum(map(len, texts))
+
+    try:
+        sub.translate(
+            translator,
+            args.src_lang,
+            destination_language,
+            args.workers,
+            translation_memory=translation_memory,
+            skip=args.skip,
+        )
+        sub.wrap_lines(args.wrap_limit)
+        sub.save(output_path(filepath, destination_language))
+    except:
+        sub.save_backup()
+        raise
+
+    return n_char
+
+
+# Skip the outputs of previous runs, and translate the biggest files first so the
+# last ones to finish are short
+filepaths = [
+    filepath
+    for filepath in find_subtitle_files(args.filepath)
+    if not any(
+        os.path.splitext(filepath)[0].endswith(f"_{language}")
+        for language in args.dest_lang
+    )
+]
+filepaths.sort(
+    key=lambda filepath: os.path.getsize(filepath) if os.path.isfile(filepath) else 0,
+    reverse=True,
+)
+# Languages of a file one after the other, so it is loaded once for all of them
+tasks = [(filepath, language) for filepath in filepaths for language in args.dest_lang]
+
+jobs = max(1, min(args.jobs, len(tasks)))
+# Progress bars of several files at the same time would be mixed up
+progress_callback = show_progress if jobs == 1 else lambda total, progress: None
+
+# Translators live for the whole run, each file borrows one (one browser, one proxy...)
+translators = queue.Queue()
+for _ in range(jobs):
+    translators.put(None)
+created_translators = []
+
+
+def run(filepath: str, destination_language: str) -> int:
+    translator = translators.get()
+    try:
+        if translator is None:
+            translator = create_translator()
+            created_translators.append(translator)
+
+        if profiler is not None:
+            return profiler.call(
+                translate_file,
+                filepath,
+                destination_language,
+                translator,
+                progress_callback,
+            )
+        return translate_file(
+            filepath, destination_language, translator, progress_callback
+        )
+    finally:
+        translators.put(translator)
+
+
+start = time.time()
+n_char = 0
+failed = []
+
+with ThreadPoolExecutor(max_workers=jobs) as executor:
+    futures = [(task, executor.submit(run, *task)) for task in tasks]
+    for (filepath, language), future in futures:
+        try:
+            n_char += future.result()
+        except:
+            failed.append(output_path(filepath, language))
+            print(f"... Failed translating {filepath} to {language}")
+            traceback.print_exc()
+
+for translator in created_translators:
+    if callable(getattr(translator, "stats", None)):
+        print(f"{type(translator).__name__}: {translator.stats()}")
+    translator.quit()
+
+if translation_memory is not None:
+    print(f"Translation memory: {translation_memory.stats()}")
+    translation_memory.close()
+
+for sink in sinks:
+    events.remove_sink(sink)
+    sink.close()
+
+elapsed = time.time() - start
+print(
+    f"Translated {len(tasks) - len(failed)}/{len(tasks)} files, "
+    f"{n_char} characters in {elapsed:.1f}s ({n_char / max(elapsed, 1e-9):.0f} char/s)"
+)
+for filepath in failed:
+    print(f"Failed: {filepath}")
+
+if profiler is not None:
+    profiler.stop()
+    previous = Profiler.load(args.profile_compare) if args.profile_compare else None
+    print(profiler.report(previous))
+    if args.profile_output:
+        profiler.dump(args.profile_output)
+        print(f"Profile saved in {args.profile_output}")
 
-translator.quit()
+if failed:
+    sys.exit(1)
@@ -1,100 +1,77 @@
-import os
 import re
 import pyass
 
-from typing import List, Generator
+from typing import Iterable, Iterator, List, Optional
 
-from .translators.base import Translator
+from .prefilter import text_rule
+from .store import SubtitleStore
+from .subtitle_file import SubtitleFile
+from . import ass_tags
 from .util import show_progress
 
+# Drawing mode (\p1, \p2...), the text is a vector shape
+DRAWING = re.compile(r"{[^}]*\\p[1-9]")
+# Line breaks and hard spaces (\N is already \\\\ once cleaned)
+ASS_BREAKS = re.compile(r"\\+[Nnh]?")
 
-class AssFile:
+
+class AssFile(SubtitleFile):
     """ASS file class abstraction
 
     Args:
         filepath (str): file path of ass
+        backup (bool, optional): Resume from the journal of a previous run with the same languages and translator. Defaults to True.
+        store (Optional[SubtitleStore], optional): Subtitles already loaded (see to_store), instead of reading the file. Defaults to None.
     """
 
-    def __init__(self, filepath: str, progress_callback=show_progress) -> None:
-        self.filepath = filepath
-        self.backup_file = f"{self.filepath}.tmp"
-        self.subtitles = []
-        self.start_from = 0
-        self.current_subtitle = 0
-        self.text_styles = []
-        self.progress_callback = progress_callback
-
-        print(f"Loading {filepath} as ASS")
-        with open(filepath, "r", encoding="utf-8", errors="ignore") as input_file:
-            self.subtitles = self.load_from_file(input_file)
-
-        self._load_backup()
-
-    def _load_backup(self):
-        if not os.path.exists(self.backup_file):
-            return
-
-        print(f"Backup file found = {self.backup_file}")
-        with open(
-            self.backup_file, "r", encoding="utf-8", errors="ignore"
-        ) as input_file:
-            subtitles = self.load_from_file(input_file)
-
-            self.start_from = len(subtitles.events)
-            self.current_subtitle = self.start_from
-            print(f"Starting from subtitle {self.start_from}")
-            self.subtitles.events = [
-                *subtitles.events,
-                *self.subtitles.events[self.start_from :],
-            ]
-
-    def load_from_file(self, input_file):
-        ass_file = pyass.load(input_file)
-        ass_file.events = sorted(ass_file.events, key=lambda e: (e.start))
-        return self._clean_subs_content(ass_file)
-
-    def _get_next_chunk(self, chunk_size: int = 4500) -> Generator:
-        """Get a portion of the subtitles at the time based on the chunk size
+    format = "ASS"
 
-        Args:
-            chunk_size (int, optional): Maximum number of letter in text chunk. Defaults to 4500.
+    def __init__(
+        self,
+        filepath: str,
+        progress_callback=show_progress,
+        backup: bool = True,
+        store: Optional[SubtitleStore] = None,
+    ) -> None:
+        # Styles replaced by placeholders in each subtitle text, by id of the subtitle
+        self.text_styles = {}
+        super().__init__(filepath, progress_callback, backup, store)
 
-        Yields:
-            Generator: Each chunk at the time
-        """
-        portion = []
+    @property
+    def _events(self) -> List:
+        return self.subtitles.events
 
-        for subtitle in self.subtitles.events[self.start_from :]:
-            # Manage ASS styles for subtitle before add it to the portion
-            # Extract a list of styles
-            # Replace the styles by |
+    @staticmethod
+    def _text(sub) -> str:
+        return sub.text
 
-            # Each style starts with { and end with }
-            # If we have an "}" then we can split and keep the part on the left and keep it in our list
-            for i in subtitle.text.split("{"):
-                if "}" in i:
-                    self.text_styles.append("{" + i.split("}")[0] + "}")
+    @staticmethod
+    def _set_text(sub, text: str) -> None:
+        sub.text = text
 
-            subtitle.text = re.sub(r"{.*?}", r"|", subtitle.text)
+    def to_store(self) -> SubtitleStore:
+        """Subtitles of the file in a compact SubtitleStore, to keep them in memory"""
+        return SubtitleStore.from_ass(self.subtitles)
 
-            # Calculate new chunk size if subtitle content is added to actual chunk
-            n_char = (
-                sum(len(sub.text) for sub in portion)  # All subtitles in chunk
-                + len(subtitle.text)  # New subtitle
-                + len(portion)  # Break lines in chunk
-                + 1  # New breakline
-            )
+    def _from_store(self, store: SubtitleStore):
+        return store.to_ass()
 
-            # If chunk goes beyond the limit, yield it
-            if n_char >= chunk_size and len(portion) != 0:
-                yield portion
-                portion = []
+    def load_from_file(self, input_file):
+        ass_file = pyass.load(input_file)
+        ass_file.events = sorted(ass_file.events, key=lambda e: (e.start))
+        return self._clean_subs_content(ass_file)
 
-            # Put subtitle content in chunk
-            portion.append(subtitle)
+    def _chunk_length(self, subtitle) -> int:
+        """Length of the subtitle text once its styles are replaced by placeholders"""
+        return len(ass_tags.protect(subtitle.text)[0])
 
-        # Yield last chunk
-        yield portion
+    def _chunk_lengths(self, subtitles: List) -> Iterator[int]:
+        for subtitle in subtitles:
+            # Replace the styles by placeholders, and keep them to put them back
+            subtitle.text, tags, leading = ass_tags.protect(subtitle.text)
+            if tags:
+                self.text_styles[id(subtitle)] = (tags, leading)
+            yield len(subtitle.text)
 
     def _clean_subs_content(self, subtitles):
         """Cleans subtitles content and delete line breaks
@@ -141,71 +118,36 @@ class AssFile:
             sub.text = sub.text.replace("////", "\n")
             sub.text = sub.text.replace(r" \\\\ ", r"\N")
 
-    def translate(
-        self,
-        translator: Translator,
-        source_language: str,
-        destination_language: str,
-    ) -> None:
-        """Translate ASS file using a translator of your choose
+    def _translated_texts(self, subs_slice: List, translation: List[str]) -> List[str]:
+        """Insert the styles of each subtitle back in its translated text instead of its placeholders
 
-        Args:
-            translator (Translator): Translator object of choose
-            destination_language (str): Destination language (must be coherent with your translator)
-            source_language (str): Source language (must be coherent with your translator)
-        """
-        print("Starting translation")
-
-        # For each chunk of the file (based on the translator capabilities)
-        for subs_slice in self._get_next_chunk(translator.max_char):
-            # Put chunk in a single text with break lines
-            text = [sub.text for sub in subs_slice]
-            text = "\n".join(text)
-
-            # Translate
-            translation = translator.translate(
-                text, source_language, destination_language
-            )
-
-            # Manage ASS commands
-            # Insert the styles back in the text instead of |
-            self.text_styles.reverse()
-            translation_with_styles = ""
-            for i in translation.split(r"|"):
-                try:
-                    # We set i at the left part because the style must "replace" the "|"
-                    translation_with_styles += i + self.text_styles.pop()
-                except IndexError:
-                    translation_with_styles += i
-
-            # Break each line back into subtitle content
-            translation = translation_with_styles.splitlines()
-            for i in range(len(subs_slice)):
-                subs_slice[i].text = translation[i]
-                self.current_subtitle += 1
-
-            self.progress_callback(
-                len(self.subtitles.events), progress=self.current_subtitle
-            )
-
-        print(f"... Translation done")
-
-    def save_backup(self):
-        self.subtitles.events = self.subtitles.events[: self.current_subtitle]
-        self.save(self.backup_file)
-
-    def _delete_backup(self):
-        if os.path.exists(self.backup_file):
-            os.remove(self.backup_file)
-
-    def save(self, filepath: str) -> None:
-        """Saves ASS to file
-
-        Args:
-            filepath (str): Path of the new file
+        Returns:
+            List[str]: Translated text of each subtitle in chunk, with its styles
         """
-        self._delete_backup()
-
-        print(f"Saving {filepath}")
+        translation_with_styles = []
+        for sub, line in zip(subs_slice, translation):
+            styles = self.text_styles.get(id(sub))
+            if styles is not None:
+                line = ass_tags.restore(line, *styles)
+            translation_with_styles.append(line)
+
+        return translation_with_styles
+
+    def _write_chunk(self, subs_slice: List, translation: List[str]) -> None:
+        for sub in subs_slice:
+            self.text_styles.pop(id(sub), None)
+        super()._write_chunk(subs_slice, translation)
+
+    def _classify(self, sub, skip: Iterable[str]) -> Optional[str]:
+        if "comments" in skip and sub.format == pyass.EventFormat.COMMENT:
+            return "comments"
+        if "drawings" in skip and DRAWING.search(sub.text):
+            return "drawings"
+
+        # Only the text shown, without styles and line breaks
+        text = ASS_BREAKS.sub(" ", ass_tags.TAG.sub("", sub.text))
+        return text_rule(text, skip)
+
+    def _dump(self, filepath: str) -> None:
         with open(filepath, "w", encoding="utf-8") as file_out:
             pyass.dump(self.subtitles, file_out)
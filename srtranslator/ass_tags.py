@@ -0,0 +1,79 @@
+"""Numbered placeholders for the ASS override tags of a subtitle
+
+Translators get "<0>Hello <1>world" instead of "{\\an8}Hello {\\i1}world", and each
+event keeps its own tags to put them back, by number. Cleaned subtitles never have
+text between < and > (AssFile removes it), so a placeholder can not be confused
+with the text, and a tag lost, repeated or moved by the translator does not shift
+the rest.
+"""
+import re
+
+from typing import Tuple
+
+TAG = re.compile(r"({.*?})")
+PLACEHOLDER = re.compile(r"<\s*(\d+)\s*>")
+
+
+def protect(text: str) -> Tuple[str, Tuple[str, ...], int]:
+    """Replace each override tag of text by its placeholder, in one pass
+
+    Args:
+        text (str): Subtitle text with tags
+
+    Returns:
+        Tuple[str, Tuple[str, ...], int]: Text with placeholders, its tags in order and how many of them are at the start of the text
+    """
+    # Text and tags alternate: text, tag, text, tag, text...
+    parts = TAG.split(text)
+    if len(parts) == 1:
+        return text, (), 0
+
+    tags = tuple(parts[1::2])
+    # Tags before any text stay at the start even if the translator drops them
+    leading = 0
+    while leading < len(tags) and parts[2 * leading] == "":
+        leading += 1
+
+    parts[1::2] = [f"<{index}>" for index in range(len(tags))]
+
+    return "".join(parts), tags, leading
+
+
+def restore(text: str, tags: Tuple[str, ...], leading: int = 0) -> str:
+    """Replace the placeholders of a translated text by their tags
+
+    Tags whose placeholder was lost go at the start of the text if they were
+    there, or at the end. Repeated or unknown placeholders are removed.
+
+    Args:
+        text (str): Translated text with placeholders
+        tags (Tuple[str, ...]): Tags returned by protect
+        leading (int, optional): Tags at the start, returned by protect. Defaults to 0.
+
+    Returns:
+        str: Translated text with tags
+    """
+    # Text and placeholder numbers alternate, like in protect
+    parts = PLACEHOLDER.split(text)
+    if parts[1::2] == [str(index) for index in range(len(tags))]:
+        # Every placeholder once and in order, the usual case
+        parts[1::2] = tags
+        return "".join(parts)
+
+    used = set()
+    for i in range(1, len(parts), 2):
+        index = int(parts[i])
+        if index < len(tags) and index not in used:
+            used.add(index)
+            parts[i] = tags[index]
+        else:
+            parts[i] = ""
+
+    text = "".join(parts)
+    if len(used) == len(tags):
+        return text
+
+    lost = [index for index in range(len(tags)) if index not in used]
+    start = "".join(tags[index] for index in lost if index < leading)
+    end = "".join(tags[index] for index in lost if index >= leading)
+    return start + text + end
@@ -0,0 +1,119 @@
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+def _is_full(
+    n_char: int,
+    n_lines: int,
+    size: int,
+    max_char: float,
+    max_lines: Optional[int],
+) -> bool:
+    # A chunk always takes at least one text, even if it goes beyond the limit
+    if n_lines == 0:
+        return False
+
+    return n_char + size >= max_char or (
+        max_lines is not None and n_lines >= max_lines
+    )
+
+
+def plan_chunks(
+    lengths: Iterable[int], max_char: float, max_lines: Optional[int] = None
+) -> Iterator[Tuple[int, int]]:
+    """Split texts in consecutive chunks that fit the translator limits
+
+    Every text takes its length plus a break line. Lengths are consumed lazily, so
+    it can plan chunks while the texts are being prepared.
+
+    Args:
+        lengths (Iterable[int]): Length of each text, in order
+        max_char (float): Chunks stay below this number of characters
+        max_lines (Optional[int], optional): Maximum number of texts per chunk. Defaults to no limit.
+
+    Yields:
+        Iterator[Tuple[int, int]]: Start and end index of each chunk
+    """
+    start = 0
+    n_texts = 0
+    n_char = 0
+
+    for index, length in enumerate(lengths):
+        if _is_full(n_char, index - start, length + 1, max_char, max_lines):
+            yield start, index
+            start = index
+            n_char = 0
+
+        n_char += length + 1
+        n_texts = index + 1
+
+    if n_texts > start:
+        yield start, n_texts
+
+
+def plan_balanced_chunks(
+    lengths: Sequence[int],
+    max_char: float,
+    max_lines: Optional[int] = None,
+    min_chunks: int = 1,
+) -> List[Tuple[int, int]]:
+    """Like plan_chunks, but all chunks have a similar size
+
+    When chunks are translated in parallel, a full chunk followed by a tiny one (or
+    a single chunk for the whole file) leaves workers idle waiting for the biggest.
+
+    Args:
+        lengths (Sequence[int]): Length of each text, in order
+        max_char (float): Chunks stay below this number of characters
+        max_lines (Optional[int], optional): Maximum number of texts per chunk. Defaults to no limit.
+        min_chunks (int, optional): Split in at least this many chunks, if there are enough texts. Defaults to 1.
+
+    Returns:
+        List[Tuple[int, int]]: Start and end index of each chunk
+    """
+    greedy = list(plan_chunks(lengths, max_char, max_lines))
+    parts = max(len(greedy), min(min_chunks, len(lengths)))
+    if parts <= 1:
+        return greedy
+
+    total = sum(length + 1 for length in lengths)
+
+    # Hitting max_char before a boundary adds an extra chunk. Then try again with
+    # that many parts, a few times at most so it stays linear
+    for _ in range(4):
+        chunks = _split_evenly(lengths, total / parts, max_char, max_lines)
+        if len(chunks) <= parts:
+            break
+        parts = len(chunks)
+
+    return chunks
+
+
+def _split_evenly(
+    lengths: Sequence[int],
+    target: float,
+    max_char: float,
+    max_lines: Optional[int],
+) -> List[Tuple[int, int]]:
+    chunks = []
+    start = 0
+    n_char = 0
+    position = 0
+
+    for end, length in enumerate(lengths):
+        size = length + 1
+        # Close the chunk when the middle of this text is past the chunk boundary
+        boundary = target * (len(chunks) + 1)
+        if (end != start and position + size / 2 > boundary) or _is_full(
+            n_char, end - start, size, max_char, max_lines
+        ):
+            chunks.append((start, end))
+            start = end
+            n_char = 0
+
+        n_char += size
+        position += size
+
+    if len(lengths) > start:
+        chunks.append((start, len(lengths)))
+
+    return chunks
@@ -0,0 +1,248 @@
+"""Command line options of python -m srtranslator
+
+Options with several values take them separated by commas or repeated (-o es,fr or
+-o es -o fr), so they never take the paths after them.
+"""
+import logging
+import argparse
+
+from typing import Callable, List, Optional, Sequence
+
+from .prefilter import RULES
+from .translators.registry import available_translators
+
+
+def comma_list(
+    choices: Optional[Sequence[str]] = None, allow_empty: bool = False
+) -> Callable[[str], List[str]]:
+    """Argparse type reading a list separated by commas, like es,fr,de
+
+    Args:
+        choices (Optional[Sequence[str]], optional): Allowed values. Defaults to any.
+        allow_empty (bool, optional): Accept "none" as an empty list. Defaults to False.
+    """
+
+    def parse(value: str) -> List[str]:
+        if allow_empty and value.strip().lower() == "none":
+            return []
+
+        items = [item.strip() for item in value.split(",") if item.strip()]
+        if not items:
+            raise argparse.ArgumentTypeError(f"no value in '{value}'")
+        for item in items:
+            if choices is not None and item not in choices:
+                raise argparse.ArgumentTypeError(
+                    f"invalid choice: '{item}' (choose from {', '.join(choices)})"
+                )
+        return items
+
+    return parse
+
+
+parser = argparse.ArgumentParser(description="Translate .STR and .ASS files")
+
+parser.add_argument(
+    "filepath",
+    metavar="path",
+    type=str,
+    nargs="+",
+    help="Files, folders or glob patterns to translate",
+)
+
+parser.add_argument(
+    "-i",
+    "--src-lang",
+    type=str,
+    default="auto",
+    help="Source language. Default: auto",
+)
+
+parser.add_argument(
+    "-o",
+    "--dest-lang",
+    metavar="DEST_LANG",
+    type=comma_list(),
+    action="append",
+    help="Destination language. Repeat it or separate languages with commas (-o es,fr) to translate into several, at the same time with --jobs. Default: es (spanish)",
+)
+
+parser.add_argument(
+    "-v",
+    "--verbose",
+    action="store_const",
+    dest="loglevel",
+    const=logging.INFO,
+    help="Increase output verbosity",
+)
+
+parser.add_argument(
+    "-vv",
+    "--debug",
+    action="store_const",
+    dest="loglevel",
+    const=logging.DEBUG,
+    default=logging.WARNING,
+    help="Increase output verbosity for debugging",
+)
+
+parser.add_argument(
+    "-s",
+    "--show-browser",
+    action="store_true",
+    help="Show browser window",
+)
+
+parser.add_argument(
+    "-w",
+    "--wrap-limit",
+    type=int,
+    default=50,
+    help="Number of characters -including spaces- to wrap a line of text. Default: 50",
+)
+
+parser.add_argument(
+    "-t",
+    "--translator",
+    type=str,
+    choices=available_translators(),
+    help="Translator to use (built-in or installed by other packages)",
+    default="deepl-scrap",
+)
+
+parser.add_argument(
+    "--fallback",
+    metavar="TRANSLATOR",
+    type=comma_list(available_translators()),
+    action="append",
+    help="Translator to use when --translator fails or is slower than usual. Repeat it or separate translators with commas, in order",
+)
+
+parser.add_argument(
+    "--hedge-percentile",
+    type=float,
+    default=0.9,
+    help="Latency percentile of a translator after which the chunk is also sent to the next one. Default: 0.9",
+)
+
+parser.add_argument(
+    "-j",
+    "--workers",
+    type=int,
+    default=1,
+    help="Number of chunks to translate at the same time (capped by the translator). Default: 1",
+)
+
+parser.add_argument(
+    "--jobs",
+    type=int,
+    default=1,
+    help="Number of files (or languages of a file) to translate at the same time, each one with its own translator. Default: 1",
+)
+
+parser.add_argument(
+    "--memory",
+    metavar="PATH",
+    type=str,
+    help="SQLite file to reuse translations from previous runs",
+)
+
+parser.add_argument(
+    "--skip",
+    metavar="RULES",
+    type=comma_list(RULES, allow_empty=True),
+    default=list(RULES),
+    help=f"Subtitles passed through untranslated, separated by commas ({', '.join(RULES)}). Default: all of them, --skip none translates everything",
+)
+
+parser.add_argument(
+    "--stream",
+    action="store_true",
+    help="Translate .srt files chunk by chunk without loading them whole, for very big files (no backup, memory or deduplication)",
+)
+
+parser.add_argument(
+    "--events",
+    metavar="PATH",
+    type=str,
+    help="Append every translation event (chunks, requests, retries, proxy rotations...) to a JSON lines file",
+)
+
+parser.add_argument(
+    "--metrics",
+    metavar="PATH",
+    type=str,
+    help="Write metrics in Prometheus text format to this file, updated after each file",
+)
+
+parser.add_argument(
+    "--profile",
+    action="store_true",
+    help="Print the time spent in each phase (browser startup, proxies, input, waits, parsing, saving...)",
+)
+
+parser.add_argument(
+    "--profile-cpu",
+    action="store_true",
+    help="Profile with cProfile too (implies --profile)",
+)
+
+parser.add_argument(
+    "--profile-memory",
+    action="store_true",
+    help="Trace memory by phase and line with tracemalloc (implies --profile)",
+)
+
+parser.add_argument(
+    "--profile-output",
+    metavar="PATH",
+    type=str,
+    help="Save the profile as JSON (and PATH.pstats with --profile-cpu) (implies --profile)",
+)
+
+parser.add_argument(
+    "--profile-compare",
+    metavar="PATH",
+    type=str,
+    help="Compare the profile with one saved by --profile-output (implies --profile)",
+)
+
+parser.add_argument(
+    "--browsers",
+    type=int,
+    default=2,
+    help="Number of browsers for deepl-scrap-pool. Use it with --workers. Default: 2",
+)
+
+parser.add_argument(
+    "--auth",
+    type=str,
+    help="Api key if needed on translator",
+)
+
+parser.add_argument(
+    "--server-url",
+    type=str,
+    help="Base URL of another server with the same API for deepl-api or pydeeplx (DeepLX), like a local mock",
+)
+
+parser.add_argument(
+    "--proxies",
+    action="store_true",
+    help="Use proxy by default for pydeeplx",
+)
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    """Parse the command line (sys.argv by default)"""
+    # Paths can also come after the options, or between them
+    args = parser.parse_intermixed_args(argv)
+    # Each language once, in order
+    args.dest_lang = list(
+        dict.fromkeys(
+            language
+            for languages in args.dest_lang or [["es"]]
+            for language in languages
+        )
+    )
+    args.fallback = [name for names in args.fallback or [] for name in names]
+    return args
@@ -0,0 +1,54 @@
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+
+from .chunking import plan_chunks
+
+T = TypeVar("T")
+
+
+def deduplicate(
+    subtitles: List[T], get_text: Callable[[T], str]
+) -> Tuple[List[T], Dict[int, List[T]]]:
+    """Keep one subtitle per distinct text
+
+    Args:
+        subtitles (List[T]): Subtitles to translate, in order
+        get_text (Callable[[T], str]): Text that would be sent to the translator
+
+    Returns:
+        Tuple[List[T], Dict[int, List[T]]]: First subtitle of each distinct text, and the
+        repeated subtitles by id of the one that is translated for them
+    """
+    unique = []
+    first_by_text = {}
+    duplicates = {}
+
+    for sub in subtitles:
+        text = get_text(sub)
+        first = first_by_text.get(text)
+        if first is None:
+            first_by_text[text] = sub
+            unique.append(sub)
+            continue
+
+        duplicates.setdefault(id(first), []).append(sub)
+
+    return unique, duplicates
+
+
+def dedup_stats(
+    lengths: List[int],
+    unique_lengths: List[int],
+    max_char: float,
+    max_lines: Optional[int] = None,
+) -> Dict[str, int]:
+    """Subtitles, characters and requests that deduplicate saves"""
+    # Each text is followed by a break line in the chunk
+    characters = sum(lengths) + len(lengths)
+    unique_characters = sum(unique_lengths) + len(unique_lengths)
+
+    return {
+        "subtitles": len(lengths) - len(unique_lengths),
+        "characters": characters - unique_characters,
+        "requests": len(list(plan_chunks(lengths, max_char, max_lines)))
+        - len(list(plan_chunks(unique_lengths, max_char, max_lines))),
+    }
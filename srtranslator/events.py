@@ -0,0 +1,330 @@
+"""Structured events of a translation, sent to pluggable sinks
+
+Subtitle files and translators call emit(). Each event is a dict with its name,
+time and fields. Without sinks emit() returns right away.
+
+Events:
+    file_started: file, backend, subtitles, characters and skipped_characters
+        (of the subtitles that need no translation)
+    chunk_started: file, backend, chunk, subtitles, characters
+    chunk_finished: same as chunk_started, plus latency
+    chunk_failed: same as chunk_started, plus latency and error
+    file_finished: file, backend, subtitles, characters, chunks, seconds and
+        characters_per_second
+    phase: file, phase, seconds (load, prefilter, recall, dedup, translate, save...)
+    request: backend, characters, latency, attempt, success (one per call to a
+        translation service, retries included)
+    proxy_rotated: backend, proxy
+    rate_limited: backend, waited
+    hedge: backend, served_by, characters, latency, hedged, failovers (one per
+        chunk of a HedgedTranslator, served_by is the translator that won)
+
+Usage:
+    from srtranslator import events
+
+    events.add_sink(events.JsonLinesSink("events.jsonl"))
+    events.add_sink(events.PrometheusSink("srtranslator.prom"))
+"""
+import os
+import json
+import time
+import itertools
+import threading
+import tracemalloc
+
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, List, Sequence
+
+Sink = Callable[[Dict], None]
+
+_sinks: List[Sink] = []
+_lock = threading.Lock()
+
+
+def add_sink(sink: Sink) -> None:
+    """Send every event to sink, a callable taking the event dict"""
+    with _lock:
+        _sinks.append(sink)
+
+
+def remove_sink(sink: Sink) -> None:
+    with _lock:
+        if sink in _sinks:
+            _sinks.remove(sink)
+
+
+def enabled() -> bool:
+    return len(_sinks) != 0
+
+
+def emit(event: str, **fields) -> None:
+    if not _sinks:
+        return
+
+    record = {"event": event, "time": time.time(), **fields}
+    for sink in list(_sinks):
+        sink(record)
+
+
+@contextmanager
+def phase(name: str, **fields):
+    """Time the block and emit it as a phase event. Works as a decorator too
+
+    When tracemalloc is tracing, the event also has the memory allocated in the
+    block (by any thread, so only approximate when phases overlap).
+    """
+    tracing = tracemalloc.is_tracing()
+    memory = tracemalloc.get_traced_memory()[0] if tracing else 0
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        if tracing:
+            fields["memory"] = tracemalloc.get_traced_memory()[0] - memory
+        emit("phase", phase=name, seconds=seconds, **fields)
+
+
+def _chunk_fields(file, backend, counter, chunk, characters) -> Dict:
+    return {
+        "file": file,
+        "backend": backend,
+        "chunk": next(counter),
+        "subtitles": len(chunk),
+        "characters": characters(chunk),
+    }
+
+
+def chunk_events(
+    func: Callable[[Sequence], Any],
+    file: str,
+    backend: str,
+    characters: Callable[[Sequence], int],
+) -> Callable[[Sequence], Any]:
+    """Wrap the translation of a chunk to emit chunk_started, chunk_finished and chunk_failed
+
+    Args:
+        func (Callable): Translates a chunk of subtitles
+        file (str): Subtitle file
+        backend (str): Translator id
+        characters (Callable): Number of characters of a chunk
+
+    Returns:
+        Callable: func, wrapped only if there are sinks
+    """
+    if not enabled():
+        return func
+
+    counter = itertools.count()
+
+    def wrapper(chunk):
+        fields = _chunk_fields(file, backend, counter, chunk, characters)
+        emit("chunk_started", **fields)
+        start = time.perf_counter()
+        try:
+            result = func(chunk)
+        except Exception as e:
+            latency = time.perf_counter() - start
+            emit("chunk_failed", latency=latency, error=repr(e), **fields)
+            raise
+
+        emit("chunk_finished", latency=time.perf_counter() - start, **fields)
+        return result
+
+    return wrapper
+
+
+def achunk_events(
+    func: Callable[[Sequence], Awaitable],
+    file: str,
+    backend: str,
+    characters: Callable[[Sequence], int],
+) -> Callable[[Sequence], Awaitable]:
+    """Same as chunk_events, for a coroutine function"""
+    if not enabled():
+        return func
+
+    counter = itertools.count()
+
+    async def wrapper(chunk):
+        fields = _chunk_fields(file, backend, counter, chunk, characters)
+        emit("chunk_started", **fields)
+        start = time.perf_counter()
+        try:
+            result = await func(chunk)
+        except Exception as e:
+            latency = time.perf_counter() - start
+            emit("chunk_failed", latency=latency, error=repr(e), **fields)
+            raise
+
+        emit("chunk_finished", latency=time.perf_counter() - start, **fields)
+        return result
+
+    return wrapper
+
+
+class JsonLinesSink:
+    """Write each event as a line of JSON
+
+    Args:
+        path (str): File where events are appended
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def __call__(self, event: Dict) -> None:
+        line = json.dumps(event, ensure_ascii=False, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class Metrics:
+    """Aggregate events in counters and latency percentiles
+
+    Args:
+        window (int, optional): Latencies kept per backend for percentiles. Defaults to 1000.
+    """
+
+    quantiles = (0.5, 0.9, 0.99)
+
+    def __init__(self, window: int = 1000) -> None:
+        self._lock = threading.Lock()
+        self.counters = defaultdict(float)
+        self.latencies = defaultdict(lambda: deque(maxlen=window))
+        self.phases = defaultdict(float)
+
+    def __call__(self, event: Dict) -> None:
+        name = event["event"]
+        backend = event.get("backend", "")
+
+        with self._lock:
+            if name == "chunk_finished":
+                self.counters[("chunks", backend)] += 1
+                self.counters[("characters", backend)] += event["characters"]
+                self.counters[("chunk_seconds", backend)] += event["latency"]
+                self.latencies[backend].append(event["latency"])
+            elif name == "chunk_failed":
+                self.counters[("chunk_failures", backend)] += 1
+            elif name == "request":
+                self.counters[("requests", backend)] += 1
+                if event.get("attempt", 1) > 1:
+                    self.counters[("retries", backend)] += 1
+                if not event.get("success", True):
+                    self.counters[("request_failures", backend)] += 1
+            elif name == "proxy_rotated":
+                self.counters[("proxy_rotations", backend)] += 1
+            elif name == "rate_limited":
+                self.counters[("rate_limit_seconds", backend)] += event["waited"]
+            elif name == "file_started":
+                skipped = event.get("skipped_characters", 0)
+                self.counters[("skipped_characters", backend)] += skipped
+            elif name == "hedge":
+                self.counters[("served", event["served_by"])] += 1
+                self.counters[("hedged", backend)] += event["hedged"]
+                self.counters[("failovers", backend)] += event["failovers"]
+            elif name == "file_finished":
+                self.counters[("files", backend)] += 1
+                self.counters[("file_seconds", backend)] += event["seconds"]
+            elif name == "phase":
+                self.phases[event["phase"]] += event["seconds"]
+
+    def percentile(self, backend: str, quantile: float) -> float:
+        with self._lock:
+            latencies = sorted(self.latencies[backend])
+        if not latencies:
+            return 0.0
+        return latencies[min(int(quantile * len(latencies)), len(latencies) - 1)]
+
+    def summary(self) -> Dict:
+        """Totals, characters per second and chunk latency percentiles by backend"""
+        with self._lock:
+            counters = dict(self.counters)
+            phases = dict(self.phases)
+            backends = list(self.latencies)
+
+        summary = {"backends": {}, "phases": phases}
+        for (metric, backend), value in counters.items():
+            summary["backends"].setdefault(backend, {})[metric] = value
+
+        for backend, metrics in summary["backends"].items():
+            seconds = metrics.get("file_seconds") or metrics.get("chunk_seconds", 0)
+            metrics["characters_per_second"] = metrics.get("characters", 0) / max(
+                seconds, 1e-9
+            )
+            if backend in backends:
+                metrics["latency"] = {
+                    str(quantile): self.percentile(backend, quantile)
+                    for quantile in self.quantiles
+                }
+
+        return summary
+
+
+class PrometheusSink(Metrics):
+    """Metrics written in the Prometheus text format, for node_exporter textfile collector
+
+    The file is replaced after every file_finished event and on close.
+
+    Args:
+        path (str): File to write, usually ending in .prom
+        window (int, optional): Latencies kept per backend for percentiles. Defaults to 1000.
+    """
+
+    def __init__(self, path: str, window: int = 1000) -> None:
+        super().__init__(window)
+        self.path = path
+        self._write_lock = threading.Lock()
+
+    def __call__(self, event: Dict) -> None:
+        super().__call__(event)
+        if event["event"] == "file_finished":
+            self.write()
+
+    def close(self) -> None:
+        self.write()
+
+    def write(self) -> None:
+        with self._lock:
+            counters = dict(self.counters)
+            phases = dict(self.phases)
+            backends = list(self.latencies)
+
+        lines = []
+        for metric in sorted({metric for metric, _ in counters}):
+            lines.append(f"# TYPE srtranslator_{metric}_total counter")
+            for (name, backend), value in sorted(counters.items()):
+                if name == metric:
+                    lines.append(
+                        f'srtranslator_{metric}_total{{backend="{backend}"}} {value}'
+                    )
+
+        lines.append("# TYPE srtranslator_chunk_latency_seconds summary")
+        for backend in sorted(backends):
+            for quantile in self.quantiles:
+                lines.append(
+                    f"srtranslator_chunk_latency_seconds"
+                    f'{{backend="{backend}",quantile="{quantile}"}} '
+                    f"{self.percentile(backend, quantile)}"
+                )
+
+        lines.append("# TYPE srtranslator_phase_seconds_total counter")
+        for phase_name, seconds in sorted(phases.items()):
+            lines.append(
+                f'srtranslator_phase_seconds_total{{phase="{phase_name}"}} {seconds}'
+            )
+
+        # Replace the file at once, so a scrape never reads half of it
+        temporary = f"{self.path}.tmp"
+        with self._write_lock:
+            with open(temporary, "w", encoding="utf-8") as output_file:
+                output_file.write("\n".join(lines) + "\n")
+            os.replace(temporary, self.path)
@@ -0,0 +1,109 @@
+import os
+import json
+import time
+import hashlib
+
+from typing import Dict, Iterable, Tuple
+
+
+def journal_path(
+    filepath: str, source_language: str, destination_language: str, translator: str
+) -> str:
+    """Journal file for a subtitle file (by content), language pair and translator"""
+    with open(filepath, "rb") as input_file:
+        file_hash = hashlib.sha256(input_file.read()).hexdigest()
+
+    key = f"{file_hash}:{source_language}:{destination_language}:{translator}"
+    return f"{filepath}.{hashlib.sha256(key.encode()).hexdigest()[:16]}.journal"
+
+
+class Journal:
+    """Append-only log of translated subtitles, one line per chunk
+
+    Each chunk is written and flushed as soon as it is translated, so it survives
+    the process being killed. fsync, needed to survive a power loss, runs at most
+    every fsync_interval seconds.
+
+    Args:
+        path (str): Journal file
+        fsync_interval (float, optional): Minimum seconds between fsync. Defaults to 5.
+    """
+
+    def __init__(self, path: str, fsync_interval: float = 5) -> None:
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self._file = None
+        self._synced_at = time.time()
+
+    def load(self) -> Dict[int, str]:
+        """Translations in the journal
+
+        Returns:
+            Dict[int, str]: Translation by subtitle index
+        """
+        entries = {}
+        if not os.path.exists(self.path):
+            return entries
+
+        with open(self.path, "r", encoding="utf-8") as journal_file:
+            for line in journal_file:
+                try:
+                    chunk = json.loads(line)
+                except ValueError:
+                    # Line cut by a crash while writing it
+                    continue
+
+                entries.update(zip(chunk["indexes"], chunk["translations"]))
+
+        return entries
+
+    def append(self, entries: Iterable[Tuple[int, str]]) -> None:
+        """Write the translations of a chunk
+
+        Args:
+            entries (Iterable[Tuple[int, str]]): Subtitle index and its translation
+        """
+        entries = list(entries)
+        if len(entries) == 0:
+            return
+
+        if self._file is None:
+            self._open()
+
+        indexes, translations = zip(*entries)
+        chunk = {"indexes": indexes, "translations": translations}
+        self._file.write(json.dumps(chunk, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+        if time.time() - self._synced_at >= self.fsync_interval:
+            self._sync()
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+
+        self._sync()
+        self._file.close()
+        self._file = None
+
+    def delete(self) -> None:
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def _open(self) -> None:
+        # Start on a new line if the last write was cut by a crash
+        needs_break_line = False
+        if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            with open(self.path, "rb") as journal_file:
+                journal_file.seek(-1, os.SEEK_END)
+                needs_break_line = journal_file.read(1) != b"\n"
+
+        self._file = open(self.path, "a", encoding="utf-8")
+        if needs_break_line:
+            self._file.write("\n")
+
+    def _sync(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._synced_at = time.time()
@@ -0,0 +1,112 @@
+"""Translate a subtitle file into several languages, loading and cleaning it once
+
+Usage:
+    from srtranslator import SrtFile
+    from srtranslator.languages import translate_languages
+
+    srt = SrtFile("movie.srt")
+    translate_languages(srt, DeeplApi(api_key), "en", ["es", "fr", "de"])
+"""
+import os
+import logging
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Union
+
+from .translators.base import Translator
+from .translation_memory import TranslationMemory
+
+
+def output_path(filepath: str, destination_language: str) -> str:
+    """Path of the translation of a file, like movie_es.srt for movie.srt"""
+    filename = os.path.splitext(filepath)
+    return f"{filename[0]}_{destination_language}{filename[1]}"
+
+
+def translate_languages(
+    subtitle_file,
+    translator: Union[Translator, Callable[[], Translator]],
+    source_language: str,
+    destination_languages: List[str],
+    workers: int = 1,
+    line_wrap_limit: int = 50,
+    translation_memory: Optional[TranslationMemory] = None,
+    jobs: Optional[int] = None,
+) -> Dict[str, str]:
+    """Translate a loaded file into several languages at the same time and save each one
+
+    Every language works on its own copy of the subtitles (see SrtFile.from_store),
+    with its own journal, and is saved next to the file with the language at the
+    end of its name. If a language fails, its progress stays in its journal and
+    the other languages go on.
+
+    Args:
+        subtitle_file (Union[SrtFile, AssFile]): File loaded once for every language. It is not modified
+        translator (Union[Translator, Callable[[], Translator]]): Translator shared by every language, or a function creating one for each language (quitted at the end)
+        source_language (str): Source language (must be coherent with your translator)
+        destination_languages (List[str]): Languages to translate into
+        workers (int, optional): Number of chunks of each language translated at the same time. A shared translator splits its max_workers between the languages. Defaults to 1.
+        line_wrap_limit (int, optional): Number of maximum characters in a line before wrap. Defaults to 50.
+        translation_memory (Optional[TranslationMemory], optional): Cache of previous translations. Defaults to None.
+        jobs (Optional[int], optional): Languages translated at the same time. Defaults to all of them. At most translator.max_workers for a shared translator.
+
+    Raises:
+        Exception: The error of the first language that failed, once the rest are done
+
+    Returns:
+        Dict[str, str]: Path of the translation by language
+    """
+    shared = isinstance(translator, Translator)
+    if jobs is None:
+        jobs = len(destination_languages)
+    if shared:
+        jobs = min(jobs, translator.max_workers)
+    jobs = max(1, min(jobs, len(destination_languages)))
+    if shared:
+        # Every language calls the same translator, keep them within its max_workers
+        workers = max(1, min(workers, translator.max_workers // jobs))
+
+    store = subtitle_file.to_store()
+
+    def translate(destination_language: str) -> str:
+        language_file = type(subtitle_file).from_store(
+            subtitle_file.filepath, store, subtitle_file.progress_callback
+        )
+        language_translator = translator if shared else translator()
+        try:
+            language_file.translate(
+                language_translator,
+                source_language,
+                destination_language,
+                workers,
+                translation_memory=translation_memory,
+            )
+            language_file.wrap_lines(line_wrap_limit)
+            filepath = output_path(subtitle_file.filepath, destination_language)
+            language_file.save(filepath)
+            return filepath
+        except:
+            language_file.save_backup()
+            raise
+        finally:
+            if not shared:
+                language_translator.quit()
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = [
+            (language, executor.submit(translate, language))
+            for language in destination_languages
+        ]
+
+    outputs = {}
+    error = None
+    for language, future in futures:
+        try:
+            outputs[language] = future.result()
+        except Exception as e:
+            logging.warning(f"{subtitle_file.filepath} not translated to {language}")
+            error = error or e
+
+    if error is not None:
+        raise error
+    return outputs
@@ -0,0 +1,79 @@
+"""Subtitles that need no translation, passed through as they are
+
+Rules:
+    symbols: no letters or numbers ("...", "♪ ♪", "?!")
+    numbers: numbers, timestamps, dates or scores ("10:30", "2-1")
+    urls: only urls or emails
+    drawings: ASS drawings (\\p1 vector shapes)
+    comments: ASS Comment events
+"""
+import re
+
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+RULES = ("symbols", "numbers", "urls", "drawings", "comments")
+
+SYMBOLS = re.compile(r"[\W_]*")
+NUMBERS = re.compile(r"[\d\W_]*")
+URL = re.compile(
+    r"(?:https?://|www\.)\S+|[\w.+-]+@[\w-]+(?:\.[\w-]+)+", flags=re.IGNORECASE
+)
+
+
+def _only_urls(text: str) -> bool:
+    words = text.split()
+    return len(words) != 0 and all(URL.fullmatch(word) for word in words)
+
+
+TEXT_RULES: Dict[str, Callable[[str], bool]] = {
+    "symbols": lambda text: SYMBOLS.fullmatch(text) is not None,
+    "numbers": lambda text: NUMBERS.fullmatch(text) is not None,
+    "urls": _only_urls,
+}
+
+
+def text_rule(text: str, rules: Iterable[str]) -> Optional[str]:
+    """First of rules that says text needs no translation, if any
+
+    Args:
+        text (str): Text that would be sent to the translator
+        rules (Iterable[str]): Rules to check, see RULES
+
+    Returns:
+        Optional[str]: Name of the rule, None if the text must be translated
+    """
+    for rule in rules:
+        if rule in TEXT_RULES and TEXT_RULES[rule](text):
+            return rule
+    return None
+
+
+def prefilter(
+    subtitles: List[T], classify: Callable[[T], Optional[str]]
+) -> Tuple[List[T], List[T], Dict[str, int]]:
+    """Split subtitles into the ones to translate and the ones that need no translation
+
+    Args:
+        subtitles (List[T]): Subtitles to translate, in order
+        classify (Callable[[T], Optional[str]]): Rule that says a subtitle needs no translation, or None
+
+    Returns:
+        Tuple[List[T], List[T], Dict[str, int]]: Subtitles to translate, the ones
+        that need no translation, and how many of them by rule
+    """
+    pending = []
+    skipped = []
+    rules = {}
+
+    for sub in subtitles:
+        rule = classify(sub)
+        if rule is None:
+            pending.append(sub)
+            continue
+
+        skipped.append(sub)
+        rules[rule] = rules.get(rule, 0) + 1
+
+    return pending, skipped, rules
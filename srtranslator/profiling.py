@@ -0,0 +1,206 @@
+import io
+import sys
+import json
+import time
+import pstats
+import logging
+import cProfile
+import platform
+import threading
+import tracemalloc
+
+from collections import defaultdict
+from typing import Dict, Optional
+
+from . import events
+
+
+class Profiler:
+    """Time (and memory) by phase of a run, from the events of files and translators
+
+    Phases: load, prefilter, recall, dedup, translate, save, create_driver, proxy,
+    input, wait_translation, plus rate_limit waits and requests by translator. Phases
+    can be nested (translate includes input and wait_translation) or overlap
+    when translating in parallel, so their sum can be more than the wall time.
+
+    Args:
+        cpu (bool, optional): Run cProfile too, from start() to stop(). Defaults to False.
+        memory (bool, optional): Trace memory with tracemalloc, by phase and by line. Defaults to False.
+    """
+
+    def __init__(self, cpu: bool = False, memory: bool = False) -> None:
+        self.cpu = cpu
+        self.memory = memory
+        self._lock = threading.Lock()
+        self._phases = defaultdict(
+            lambda: {"calls": 0, "seconds": 0.0, "max": 0.0, "memory": 0}
+        )
+        self._profile = cProfile.Profile() if cpu else None
+        # Before Python 3.12 cProfile only sees its own thread, so each call() has
+        # one. Since 3.12 it sees every thread, and only one can be enabled at once
+        self._per_thread = sys.version_info < (3, 12)
+        self._thread_profiles = []
+        self._snapshot = None
+        self._start = None
+        self.wall_time = 0.0
+        self.peak_memory = 0
+
+    def __call__(self, event: Dict) -> None:
+        name = event["event"]
+        if name == "phase":
+            self._add(event["phase"], event["seconds"], event.get("memory", 0))
+        elif name == "request":
+            self._add(f"request:{event['backend']}", event["latency"])
+        elif name == "rate_limited":
+            self._add("rate_limit", event["waited"])
+
+    def _add(self, phase: str, seconds: float, memory: int = 0) -> None:
+        with self._lock:
+            stats = self._phases[phase]
+            stats["calls"] += 1
+            stats["seconds"] += seconds
+            stats["max"] = max(stats["max"], seconds)
+            stats["memory"] += memory
+
+    def start(self) -> None:
+        if self.memory:
+            tracemalloc.start()
+        events.add_sink(self)
+        self._start = time.perf_counter()
+        if self._profile is not None:
+            try:
+                self._profile.enable()
+            except ValueError:
+                # Another profiler or debugger is using sys.monitoring
+                logging.warning("Unable to start cProfile, another profiler is active")
+                self._profile = None
+
+    def stop(self) -> None:
+        if self._profile is not None:
+            self._profile.disable()
+        self.wall_time = time.perf_counter() - self._start
+        events.remove_sink(self)
+        if self.memory:
+            self._snapshot = tracemalloc.take_snapshot()
+            self.peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    def call(self, func, *args, **kwargs):
+        """Call func, profiled if cpu is on. Use it in worker threads"""
+        if self._profile is None or not self._per_thread:
+            return func(*args, **kwargs)
+
+        profile = cProfile.Profile()
+        try:
+            return profile.runcall(func, *args, **kwargs)
+        finally:
+            with self._lock:
+                self._thread_profiles.append(profile)
+
+    def _cpu_stats(self, stream=None) -> Optional[pstats.Stats]:
+        """Stats of every profile, None if none of them saw a call"""
+        with self._lock:
+            profiles = [self._profile, *self._thread_profiles]
+
+        stats = None
+        for profile in profiles:
+            try:
+                if stats is None:
+                    stats = pstats.Stats(profile, stream=stream)
+                else:
+                    stats.add(profile)
+            except TypeError:
+                # pstats refuses profiles without calls (a call that failed at once)
+                continue
+        return stats
+
+    def results(self) -> Dict:
+        """Phases ranked by time, with the wall time and peak memory of the run"""
+        with self._lock:
+            phases = {name: dict(stats) for name, stats in self._phases.items()}
+
+        ranked = dict(
+            sorted(phases.items(), key=lambda item: item[1]["seconds"], reverse=True)
+        )
+        results = {
+            "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "wall_time": self.wall_time,
+            "phases": ranked,
+        }
+        if self._snapshot is not None:
+            results["peak_memory"] = self.peak_memory
+            results["memory_by_line"] = [
+                {"line": str(stat.traceback), "size": stat.size, "count": stat.count}
+                for stat in self._snapshot.statistics("lineno")[:15]
+            ]
+
+        return results
+
+    def report(self, previous: Optional[Dict] = None) -> str:
+        """Ranked report of the phases, compared with the results of another run
+
+        Args:
+            previous (Optional[Dict], optional): results() of a previous run. Defaults to None.
+
+        Returns:
+            str: Report to print
+        """
+        results = self.results()
+        old_phases = (previous or {}).get("phases", {})
+        wall_time = max(results["wall_time"], 1e-9)
+
+        lines = [f"Wall time {results['wall_time']:.2f}s"]
+        if previous:
+            lines[0] += f" (previous run {previous['wall_time']:.2f}s)"
+        header = f"{'phase':<24}{'calls':>8}{'total':>11}{'mean':>10}{'max':>10}"
+        header += f"{'wall':>7}"
+        if self.memory:
+            header += f"{'memory':>11}"
+        if previous:
+            header += "  vs previous"
+        lines.append(header)
+
+        for name, stats in results["phases"].items():
+            line = (
+                f"{name:<24}{stats['calls']:>8}{stats['seconds']:>10.3f}s"
+                f"{stats['seconds'] / stats['calls']:>9.3f}s{stats['max']:>9.3f}s"
+                f"{stats['seconds'] / wall_time:>7.0%}"
+            )
+            if self.memory:
+                line += f"{stats['memory'] / 2**20:>9.1f}MB"
+            if name in old_phases:
+                ratio = stats["seconds"] / max(old_phases[name]["seconds"], 1e-9)
+                line += f"  {ratio:.2f}x"
+            lines.append(line)
+
+        if "peak_memory" in results:
+            lines.append(f"Peak traced memory {results['peak_memory'] / 2**20:.1f}MB")
+            lines.append("Top allocations by line:")
+            for stat in results["memory_by_line"][:10]:
+                lines.append(f"  {stat['size'] / 1024:>10.1f}KB  {stat['line']}")
+
+        if self._profile is not None:
+            output = io.StringIO()
+            stats = self._cpu_stats(output)
+            if stats is None:
+                lines.append("No CPU profile collected")
+            else:
+                stats.sort_stats("cumulative").print_stats(20)
+                lines.append(output.getvalue())
+
+        return "\n".join(lines)
+
+    def dump(self, path: str) -> None:
+        """Save results() as JSON, and cProfile stats (for pstats or snakeviz) next to it"""
+        with open(path, "w", encoding="utf-8") as output_file:
+            json.dump(self.results(), output_file, indent=2)
+
+        stats = self._cpu_stats() if self._profile is not None else None
+        if stats is not None:
+            stats.dump_stats(f"{path}.pstats")
+
+    @staticmethod
+    def load(path: str) -> Dict:
+        with open(path, "r", encoding="utf-8") as input_file:
+            return json.load(input_file)
@@ -1,98 +1,57 @@
-import os
 import re
 import srt
 
 from srt import Subtitle
-from typing import List, Generator
+from typing import Iterable, List
 
-from .translators.base import Translator
-from .util import show_progress
+from .store import SubtitleStore
+from .srt_parser import read_srt
+from .subtitle_file import SubtitleFile
 
 
-class SrtFile:
+class SrtFile(SubtitleFile):
     """SRT file class abstraction
 
     Args:
         filepath (str): file path of srt
+        backup (bool, optional): Resume from the journal of a previous run with the same languages and translator. Defaults to True.
+        store (Optional[SubtitleStore], optional): Subtitles already loaded (see to_store), instead of reading the file. Defaults to None.
     """
 
-    def __init__(self, filepath: str, progress_callback=show_progress) -> None:
-        self.filepath = filepath
-        self.backup_file = f"{self.filepath}.tmp"
-        self.subtitles = []
-        self.start_from = 0
-        self.current_subtitle = 0
-        self.progress_callback = progress_callback
-
-        print(f"Loading {filepath} as SRT")
-        with open(filepath, "r", encoding="utf-8", errors="ignore") as input_file:
-            self.subtitles = self.load_from_file(input_file)
-
-        self._load_backup()
-
-    def _load_backup(self):
-        if not os.path.exists(self.backup_file):
-            return
-
-        print(f"Backup file found = {self.backup_file}")
-        with open(
-            self.backup_file, "r", encoding="utf-8", errors="ignore"
-        ) as input_file:
-            subtitles = self.load_from_file(input_file)
-
-            self.start_from = len(subtitles)
-            self.current_subtitle = self.start_from
-            print(f"Starting from subtitle {self.start_from}")
-            self.subtitles = [
-                *subtitles,
-                *self.subtitles[self.start_from :],
-            ]
+    format = "SRT"
 
-    def load_from_file(self, input_file):
-        srt_file = srt.parse(input_file)
-        subtitles = list(srt_file)
-        subtitles = list(srt.sort_and_reindex(subtitles))
-        return self._clean_subs_content(subtitles)
-
-    def _get_next_chunk(self, chunk_size: int = 4500) -> Generator:
-        """Get a portion of the subtitles at the time based on the chunk size
-
-        Args:
-            chunk_size (int, optional): Maximum number of letter in text chunk. Defaults to 4500.
+    @property
+    def _events(self) -> List[Subtitle]:
+        return self.subtitles
 
-        Yields:
-            Generator: Each chunk at the time
-        """
-        portion = []
+    @staticmethod
+    def _text(sub: Subtitle) -> str:
+        return sub.content
 
-        for subtitle in self.subtitles[self.start_from :]:
-            # Calculate new chunk size if subtitle content is added to actual chunk
-            n_char = (
-                sum(len(sub.content) for sub in portion)  # All subtitles in chunk
-                + len(subtitle.content)  # New subtitle
-                + len(portion)  # Break lines in chunk
-                + 1  # New breakline
-            )
+    @staticmethod
+    def _set_text(sub: Subtitle, text: str) -> None:
+        sub.content = text
 
-            # If chunk goes beyond the limit, yield it
-            if n_char >= chunk_size and len(portion) != 0:
-                yield portion
-                portion = []
+    def to_store(self) -> SubtitleStore:
+        """Subtitles of the file in a compact SubtitleStore, to keep them in memory"""
+        return SubtitleStore.from_srt(self.subtitles)
 
-            # Put subtitle content in chunk
-            portion.append(subtitle)
+    def _from_store(self, store: SubtitleStore) -> List[Subtitle]:
+        return store.to_srt()
 
-        # Yield last chunk
-        yield portion
+    def load_from_file(self, input_file):
+        subtitles = read_srt(input_file)
+        return self._clean_subs_content(subtitles)
 
-    def _clean_subs_content(self, subtitles: List[Subtitle]) -> List[Subtitle]:
+    @staticmethod
+    def _clean_subs_content(subtitles: Iterable[Subtitle]) -> Iterable[Subtitle]:
         """Cleans subtitles content and delete line breaks
 
         Args:
-            subtitles (List[Subtitle]): List of subtitles
+            subtitles (Iterable[Subtitle]): Subtitles
 
         Returns:
-            List[Subtitle]: Same list of subtitles, but cleaned
+            Iterable[Subtitle]: Same subtitles, but cleaned
         """
         cleanr = re.compile("<.*?>")
 
@@ -119,17 +78,29 @@ class SrtFile:
             line_wrap_limit (int): Number of maximum characters in a line before wrap. Defaults to 50.
         """
         for sub in self.subtitles:
-            sub.content = sub.content.replace("////", "\n")
+            sub.content = self.wrap_content(sub.content, line_wrap_limit)
 
-            content = []
-            for line in sub.content.split("\n"):
-                if len(line) > line_wrap_limit:
-                    line = self.wrap_line(line, line_wrap_limit)
-                content.append(line)
+    @staticmethod
+    def wrap_content(content: str, line_wrap_limit: int = 50) -> str:
+        """Restore the line breaks of a subtitle content and wrap its lines
 
-            sub.content = "\n".join(content)
+        Args:
+            content (str): Subtitle content
+            line_wrap_limit (int): Number of maximum characters in a line before wrap. Defaults to 50.
 
-    def wrap_line(self, text: str, line_wrap_limit: int = 50) -> str:
+        Returns:
+            str: Content wraped
+        """
+        lines = []
+        for line in content.replace("////", "\n").split("\n"):
+            if len(line) > line_wrap_limit:
+                line = SrtFile.wrap_line(line, line_wrap_limit)
+            lines.append(line)
+
+        return "\n".join(lines)
+
+    @staticmethod
+    def wrap_line(text: str, line_wrap_limit: int = 50) -> str:
         """Wraps a line of text without breaking any word in half
 
         Args:
@@ -156,59 +127,7 @@ class SrtFile:
         # Join sentences with line break
         return "\n".join(wraped_lines)
 
-    def translate(
-        self,
-        translator: Translator,
-        source_language: str,
-        destination_language: str,
-    ) -> None:
-        """Translate SRT file using a translator of your choose
-
-        Args:
-            translator (Translator): Translator object of choose
-            destination_language (str): Destination language (must be coherent with your translator)
-            source_language (str): Source language (must be coherent with your translator)
-        """
-        print("Starting translation")
-
-        # For each chunk of the file (based on the translator capabilities)
-        for subs_slice in self._get_next_chunk(translator.max_char):
-            # Put chunk in a single text with break lines
-            text = [sub.content for sub in subs_slice]
-            text = "\n".join(text)
-
-            # Translate
-            translation = translator.translate(
-                text, source_language, destination_language
-            )
-
-            # Break each line back into subtitle content
-            translation = translation.splitlines()
-            for i in range(len(subs_slice)):
-                subs_slice[i].content = translation[i]
-                self.current_subtitle += 1
-
-            self.progress_callback(len(self.subtitles), progress=self.current_subtitle)
-
-        print(f"... Translation done")
-
-    def save_backup(self):
-        self.subtitles = self.subtitles[: self.current_subtitle]
-        self.save(self.backup_file)
-
-    def _delete_backup(self):
-        if os.path.exists(self.backup_file):
-            os.remove(self.backup_file)
-
-    def save(self, filepath: str) -> None:
-        """Saves SRT to file
-
-        Args:
-            filepath (str): Path of the new file
-        """
-        self._delete_backup()
-
-        print(f"Saving {filepath}")
+    def _dump(self, filepath: str) -> None:
         subtitles = srt.compose(self.subtitles)
         with open(filepath, "w", encoding="utf-8") as file_out:
             file_out.write(subtitles)
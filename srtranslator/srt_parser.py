@@ -0,0 +1,228 @@
+"""Fast SRT reader: the file is memory-mapped and split at its timestamp lines
+
+srt.parse matches one big regex per subtitle on the decoded text, and
+srt.sort_and_reindex sorts and copies every subtitle after it. Here one regex
+finds the start of every block (its index and timestamp lines) in the raw bytes,
+the content of a block is everything up to the next one, and only the content is
+decoded. The subtitles are the ones of srt.parse and srt.sort_and_reindex, but:
+
+- a block with a timestamp line srt can not read is skipped with a warning,
+  instead of aborting the whole file
+- a timestamp line always starts a new subtitle, even without a blank line
+  before it (srt.parse keeps it in the content of an empty subtitle, or of any
+  subtitle if it has no index line)
+- the subtitles are only sorted if they are not in time order already
+- a block in a form this reader does not know (full-width delimiters...) is
+  parsed by srt, and so is a file where no block is found at all
+"""
+import io
+import re
+import mmap
+import logging
+import srt
+
+from datetime import timedelta
+from srt import Subtitle
+from typing import IO, List, Union
+
+logger = logging.getLogger(__name__)
+
+BOM = b"\xef\xbb\xbf"
+ZERO = timedelta(0)
+
+INDEX_LINE = rb"(?:[ \t]*(-?[0-9]+\.?[0-9]*)\s*\r?\n)?"
+# Start and end times, and the proprietary text after them, as srt.parse reads them
+TIMESTAMP_LINE = (
+    rb"[ \t]*([0-9]+)[,.:]([0-9]+)[,.:]([0-9]+)[,.:]?([0-9]*) *-[ -] *> *"
+    rb"([0-9]+)[,.:]([0-9]+)[,.:]([0-9]+)[,.:]?([0-9]*) ?([^\r\n]*)"
+)
+# Any other line starting with "00:00" and with an arrow starts a block too, even
+# if srt would not read it, so a malformed block does not end up in the content of
+# the previous one
+MALFORMED_LINE = rb"([ \t]*[0-9]+(?::|\xef\xbc\x9a)[0-9]+[^\r\n]*?-[ -]? *>[^\r\n]*)"
+BLOCK = (
+    INDEX_LINE + rb"(?:" + TIMESTAMP_LINE + rb"|" + MALFORMED_LINE + rb")\r?(?=\n|\Z)"
+)
+# Matching after a line break is much faster than with ^ and re.MULTILINE, the
+# first block of the file is matched on its own
+FIRST_BLOCK = re.compile(rb"\s*" + BLOCK)
+NEXT_BLOCK = re.compile(rb"\n" + BLOCK)
+
+
+def _index(raw_index: bytes) -> int:
+    try:
+        return int(raw_index)
+    except ValueError:
+        # Index 123.4, like srt.parse
+        return int(raw_index.split(b".")[0])
+
+
+def _content(data: bytes, start: int, end: int) -> str:
+    """Content between a timestamp line and the next block, as srt.parse reads it"""
+    content = data[start:end]
+    if content.endswith(b"\n\n") and not content.endswith(b"\r\n\n"):
+        content = content[:-2]
+    else:
+        # The line break ending the content, and the blank line between blocks
+        for _ in range(2):
+            if content.endswith(b"\r\n"):
+                content = content[:-2]
+            elif content.endswith(b"\n"):
+                content = content[:-1]
+
+    content = content.decode("utf-8", errors="ignore")
+    if "\r" in content:
+        content = content.replace("\r\n", "\n")
+    return content
+
+
+def parse_srt(data: Union[bytes, mmap.mmap]) -> List[Subtitle]:
+    """Subtitles of an SRT file, in the order of the file, as srt.parse returns them
+
+    Blocks with a timestamp line that can not be read are skipped.
+
+    Args:
+        data (Union[bytes, mmap.mmap]): Content of the file, UTF-8 encoded
+
+    Raises:
+        srt.SRTParseError: If there is text but no subtitle at all in it
+
+    Returns:
+        List[Subtitle]: Subtitles, with the index of the file (None if missing)
+    """
+    offset = len(BOM) if data[: len(BOM)] == BOM else 0
+    matches = []
+    first = FIRST_BLOCK.match(data, offset)
+    if first is not None:
+        matches.append(first)
+        offset = first.end()
+    matches.extend(NEXT_BLOCK.finditer(data, offset))
+
+    if not matches:
+        text = data[offset:].decode("utf-8", errors="ignore")
+        return list(srt.parse(text))
+    if first is None and data[offset : matches[0].start()].strip():
+        logger.warning("Text before the first subtitle ignored")
+
+    # A block ends with the line break before the next one
+    ends = [match.start() + 1 for match in matches[1:]]
+    ends.append(len(data))
+
+    subtitles = []
+    malformed = 0
+    for match, end in zip(matches, ends):
+        (
+            raw_index,
+            hours,
+            minutes,
+            seconds,
+            msecs,
+            end_hours,
+            end_minutes,
+            end_seconds,
+            end_msecs,
+            proprietary,
+            malformed_line,
+        ) = match.groups()
+
+        if malformed_line is not None:
+            exotic = []
+            if not malformed_line.isascii():
+                # Full-width delimiters, that srt reads
+                block = data[match.start() : end].decode("utf-8", errors="ignore")
+                exotic = list(srt.parse(block, ignore_errors=True))
+            if not exotic:
+                malformed += 1
+            subtitles.extend(exotic)
+            continue
+
+        subtitles.append(
+            Subtitle(
+                index=None if raw_index is None else _index(raw_index),
+                start=timedelta(
+                    0,
+                    int(hours) * 3600 + int(minutes) * 60 + int(seconds),
+                    0,
+                    int(msecs or 0),
+                ),
+                end=timedelta(
+                    0,
+                    int(end_hours) * 3600 + int(end_minutes) * 60 + int(end_seconds),
+                    0,
+                    int(end_msecs or 0),
+                ),
+                content=_content(data, match.end() + 1, end),
+                proprietary=proprietary.decode("utf-8", errors="ignore")
+                if proprietary
+                else "",
+            )
+        )
+
+    if malformed != 0:
+        logger.warning("Skipped %d subtitles with unreadable timestamps", malformed)
+
+    return subtitles
+
+
+def _order(sub: Subtitle) -> tuple:
+    # Subtitle.__lt__, but subtitles without index can be compared with the others
+    return sub.start, sub.end, -1 if sub.index is None else sub.index
+
+
+def sort_and_reindex(subtitles: List[Subtitle]) -> List[Subtitle]:
+    """srt.sort_and_reindex in place, without sorting subtitles already in order
+
+    Args:
+        subtitles (List[Subtitle]): Subtitles, from parse_srt
+
+    Returns:
+        List[Subtitle]: Subtitles in time order, numbered from 1, without the ones
+        with no content, a negative start or a start not before their end
+    """
+    keys = [_order(sub) for sub in subtitles]
+    if any(key < previous for previous, key in zip(keys, keys[1:])):
+        subtitles = sorted(subtitles, key=_order)
+
+    kept = [
+        sub
+        for sub in subtitles
+        if sub.start >= ZERO and sub.start < sub.end and sub.content.strip() != ""
+    ]
+    for index, sub in enumerate(kept, 1):
+        sub.index = index
+    return kept
+
+
+def read_srt(input_file: IO) -> List[Subtitle]:
+    """Subtitles of an SRT file sorted and numbered, like srt.parse and srt.sort_and_reindex
+
+    A file on disk is memory-mapped instead of read.
+
+    Args:
+        input_file (IO): SRT file, opened in text or binary mode, or a StringIO
+
+    Returns:
+        List[Subtitle]: Subtitles in time order, numbered from 1
+    """
+    raw_file = getattr(input_file, "buffer", input_file)
+    try:
+        fileno = raw_file.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        fileno = None
+
+    data = None
+    if fileno is not None:
+        try:
+            data = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            # Empty files, pipes and other files that can not be mapped
+            pass
+
+    if data is not None:
+        with data:
+            return sort_and_reindex(parse_srt(data))
+
+    data = input_file.read()
+    if isinstance(data, str):
+        data = data.encode("utf-8", errors="ignore")
+    return sort_and_reindex(parse_srt(data))
@@ -0,0 +1,193 @@
+import os
+import re
+import srt
+
+from collections import deque
+from datetime import timedelta
+from srt import Subtitle
+from typing import BinaryIO, Iterator, List, Tuple
+
+from . import events
+from .srt_file import SrtFile
+from .translation_memory import translator_id
+from .translators.base import Translator
+from .chunking import plan_chunks
+from .util import show_progress, ordered_map
+
+TIMESTAMP_LINE = re.compile(r"\s*\d+:\d+:\d+(?:[,.:]\d+)?\s*-->")
+
+
+def read_blocks(input_file: BinaryIO) -> Iterator[Tuple[str, int]]:
+    """Split an SRT file in the text of each subtitle, reading it line by line
+
+    A subtitle starts at its timestamp line (with the index line before it, if
+    any), so contents with blank lines are kept whole, like srt.parse does.
+
+    Args:
+        input_file (BinaryIO): SRT file opened in binary mode
+
+    Yields:
+        Iterator[Tuple[str, int]]: Text of a subtitle and bytes read up to it
+    """
+    lines = []
+    has_timestamp = False
+    position = 0
+
+    for raw_line in input_file:
+        line = raw_line.decode("utf-8", errors="ignore")
+        if position == 0:
+            line = line.lstrip("\ufeff")
+        position += len(raw_line)
+
+        if TIMESTAMP_LINE.match(line):
+            # The index line belongs to the subtitle starting here
+            split = len(lines)
+            if split != 0 and lines[-1].strip().isdigit():
+                split -= 1
+
+            if has_timestamp:
+                yield "".join(lines[:split]), position
+                lines = lines[split:]
+            has_timestamp = True
+
+        lines.append(line)
+
+    if has_timestamp:
+        yield "".join(lines), position
+
+
+class SrtStream:
+    """SRT file translated and written chunk by chunk, without loading it whole
+
+    Subtitles go through a pipeline of generators: read, clean, chunk, translate
+    (at most 2 * workers chunks ahead) and write. Memory use does not depend on the
+    file length, unless the subtitles are not in time order: then the whole file
+    is loaded to sort them, like SrtFile does.
+
+    There is no backup, journal, translation memory or deduplication, as they need
+    the whole file. Use SrtFile for those.
+
+    Args:
+        filepath (str): file path of srt
+        progress_callback (optional): Called with the file size and bytes translated
+    """
+
+    def __init__(self, filepath: str, progress_callback=show_progress) -> None:
+        self.filepath = filepath
+        self.progress_callback = progress_callback
+
+    def _parse(self) -> Iterator[Tuple[Subtitle, int]]:
+        with open(self.filepath, "rb") as input_file:
+            for block, position in read_blocks(input_file):
+                for sub in srt.parse(block, ignore_errors=True):
+                    yield sub, position
+
+    def _is_sorted(self) -> bool:
+        previous = None
+        for sub, _ in self._parse():
+            if previous is not None and sub < previous:
+                return False
+            previous = sub
+
+        return True
+
+    def _subtitles(self) -> Iterator[Tuple[Subtitle, int]]:
+        """Subtitles sorted and cleaned, as SrtFile loads them"""
+        subtitles = self._parse()
+        if not self._is_sorted():
+            print("... Subtitles are not in time order, loading all to sort them")
+            subtitles = sorted(subtitles, key=lambda item: item[0])
+
+        for sub, position in subtitles:
+            # Same subtitles srt.sort_and_reindex skips
+            if sub.content.strip() == "" or sub.start < timedelta(0):
+                continue
+            if sub.start >= sub.end:
+                continue
+
+            SrtFile._clean_subs_content([sub])
+            yield sub, position
+
+    def _chunks(
+        self, subtitles: Iterator[Tuple[Subtitle, int]], translator: Translator
+    ) -> Iterator[List[Tuple[Subtitle, int]]]:
+        # plan_chunks closes a chunk when it sees the next subtitle, so at most one
+        # subtitle waits here besides the chunk
+        buffer = deque()
+
+        def lengths():
+            for item in subtitles:
+                buffer.append(item)
+                yield len(item[0].content)
+
+        for start, end in plan_chunks(
+            lengths(), translator.max_char, translator.max_lines
+        ):
+            yield [buffer.popleft() for _ in range(end - start)]
+
+    def translate(
+        self,
+        translator: Translator,
+        source_language: str,
+        destination_language: str,
+        filepath: str,
+        workers: int = 1,
+        line_wrap_limit: int = 50,
+    ) -> int:
+        """Translate SRT file, writing each chunk to filepath as soon as it is translated
+
+        Args:
+            translator (Translator): Translator object of choose
+            source_language (str): Source language (must be coherent with your translator)
+            destination_language (str): Destination language (must be coherent with your translator)
+            filepath (str): Path of the new file
+            workers (int, optional): Number of chunks to translate at the same time. Defaults to 1.
+            line_wrap_limit (int, optional): Number of maximum characters in a line before wrap. Defaults to 50.
+
+        Returns:
+            int: Number of characters translated
+        """
+        print("Starting translation")
+        workers = max(1, min(workers, translator.max_workers))
+        total = os.path.getsize(self.filepath)
+
+        def translate_chunk(chunk):
+            return translator.translate_batch(
+                [sub.content for sub, _ in chunk],
+                source_language,
+                destination_language,
+            )
+
+        translate_chunk = events.chunk_events(
+            translate_chunk,
+            self.filepath,
+            translator_id(translator),
+            lambda chunk: sum(len(sub.content) for sub, _ in chunk),
+        )
+
+        n_char = 0
+        index = 1
+        progress = 0
+        chunks = self._chunks(self._subtitles(), translator)
+        print(f"Saving {filepath}")
+        with open(filepath, "w", encoding="utf-8") as file_out:
+            for chunk, translation in ordered_map(translate_chunk, chunks, workers):
+                for (sub, position), content in zip(chunk, translation):
+                    n_char += len(sub.content)
+                    sub.content = SrtFile.wrap_content(content, line_wrap_limit)
+
+                    # srt.compose skips empty subtitles and reindexes the rest
+                    if sub.content.strip() == "":
+                        continue
+                    sub.index = index
+                    index += 1
+                    file_out.write(sub.to_srt())
+
+                file_out.flush()
+                progress = position
+                self.progress_callback(total, progress=progress)
+
+        if progress < total:
+            self.progress_callback(total, progress=total)
+        print(f"... Translation done")
+        return n_char
@@ -0,0 +1,142 @@
+"""Compact store of the subtitles of a file: times in arrays, text in one list
+
+srt.Subtitle and pyass.Event objects take hundreds of bytes each (a __dict__, two
+timedeltas...), and the garbage collector has to walk all of them. A store keeps
+start and end times as integer milliseconds in array("q"), the text in a list,
+and everything else (proprietary field, ASS style, layer, margins...) as an index
+into a list of the distinct values, as most subtitles of a file share them.
+
+SrtFile and AssFile convert their subtitles to a store (to_store) and back
+(from_store), so a file can be kept in memory cheaply until it is translated.
+"""
+import srt
+import sys
+import pyass
+
+from array import array
+from datetime import timedelta
+from typing import Any, Dict, Iterator, List, Tuple
+
+ONE_MS = timedelta(milliseconds=1)
+
+
+class SubtitleStore:
+    """Subtitles of a file as arrays
+
+    Args:
+        header (Any, optional): What a file has besides its subtitles (the ASS script without events). Defaults to None.
+    """
+
+    __slots__ = (
+        "starts",
+        "ends",
+        "texts",
+        "fields",
+        "field_ids",
+        "_field_index",
+        "header",
+    )
+
+    def __init__(self, header: Any = None) -> None:
+        self.starts = array("q")
+        self.ends = array("q")
+        self.texts: List[str] = []
+        # Distinct values of the other fields, and the one of each subtitle
+        self.fields: List[Tuple] = []
+        self.field_ids = array("q")
+        self._field_index: Dict[Tuple, int] = {}
+        self.header = header
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def append(
+        self, start: timedelta, end: timedelta, text: str, fields: Tuple
+    ) -> None:
+        field_id = self._field_index.get(fields)
+        if field_id is None:
+            field_id = self._field_index[fields] = len(self.fields)
+            self.fields.append(fields)
+
+        self.starts.append(start // ONE_MS)
+        self.ends.append(end // ONE_MS)
+        self.texts.append(text)
+        self.field_ids.append(field_id)
+
+    def __iter__(self) -> Iterator[Tuple[timedelta, timedelta, str, Tuple]]:
+        """Start, end, text and the other fields of each subtitle"""
+        for start, end, text, field_id in zip(
+            self.starts, self.ends, self.texts, self.field_ids
+        ):
+            yield ONE_MS * start, ONE_MS * end, text, self.fields[field_id]
+
+    def memory(self) -> int:
+        """Approximate bytes used by the store, text included"""
+        size = sys.getsizeof(self.texts) + sum(map(sys.getsizeof, self.texts))
+        for values in (self.starts, self.ends, self.field_ids):
+            size += sys.getsizeof(values)
+        return size + sys.getsizeof(self.fields) + sum(
+            sys.getsizeof(fields) for fields in self.fields
+        )
+
+    @classmethod
+    def from_srt(cls, subtitles: List[srt.Subtitle]) -> "SubtitleStore":
+        store = cls()
+        for sub in subtitles:
+            store.append(sub.start, sub.end, sub.content, (sub.proprietary,))
+        return store
+
+    def to_srt(self) -> List[srt.Subtitle]:
+        """srt.Subtitle objects, numbered from 1"""
+        return [
+            srt.Subtitle(index, start, end, text, fields[0])
+            for index, (start, end, text, fields) in enumerate(self, 1)
+        ]
+
+    @classmethod
+    def from_ass(cls, script: pyass.Script) -> "SubtitleStore":
+        # The script without events is shared by the store and the scripts made from it
+        header = pyass.Script()
+        header.sections = list(script.sections)
+        header.events = []
+
+        store = cls(header)
+        for event in script.events:
+            store.append(
+                event.start,
+                event.end,
+                event.text,
+                (
+                    event.format,
+                    event.layer,
+                    event.style,
+                    event.name,
+                    event.marginL,
+                    event.marginR,
+                    event.marginV,
+                    event.effect,
+                ),
+            )
+        return store
+
+    def to_ass(self) -> pyass.Script:
+        """pyass.Script with the header of the store and its events"""
+        script = pyass.Script()
+        script.sections = list(self.header.sections)
+        script.events = [
+            pyass.Event(
+                format=fields[0],
+                layer=fields[1],
+                start=start,
+                end=end,
+                style=fields[2],
+                name=fields[3],
+                marginL=fields[4],
+                marginR=fields[5],
+                marginV=fields[6],
+                effect=fields[7],
+                text=text,
+            )
+            for start, end, text, fields in self
+        ]
+        return script
@@ -0,0 +1,616 @@
+import time
+import logging
+import asyncio
+
+from typing import Callable, Dict, Iterable, Iterator, List, Generator, Optional, Tuple
+
+from .translators.base import Translator
+from .translation_memory import TranslationMemory, translator_id
+from .chunking import plan_chunks, plan_balanced_chunks
+from .dedup import deduplicate, dedup_stats
+from .prefilter import RULES, prefilter, text_rule
+from .store import SubtitleStore
+from .journal import Journal, journal_path
+from . import events
+from .util import show_progress, ordered_map
+
+
+class SubtitleFile:
+    """Translation of a subtitle file, whatever its format (see SrtFile and AssFile)
+
+    A format gives the list of its subtitles (_events), the text of a subtitle
+    (_text and _set_text), and how to load, store and save them.
+
+    Args:
+        filepath (str): file path of the subtitles
+        backup (bool, optional): Resume from the journal of a previous run with the same languages and translator. Defaults to True.
+        store (Optional[SubtitleStore], optional): Subtitles already loaded (see to_store), instead of reading the file. Defaults to None.
+    """
+
+    # Name of the format, for the messages
+    format = ""
+
+    def __init__(
+        self,
+        filepath: str,
+        progress_callback=show_progress,
+        backup: bool = True,
+        store: Optional[SubtitleStore] = None,
+    ) -> None:
+        self.filepath = filepath
+        self.resume = backup
+        self.subtitles = []
+        self.current_subtitle = 0
+        # Ids of subtitles translated in this run, maybe out of order
+        self._translated = set()
+        # Repeated subtitles by id of the one translated for them
+        self._duplicates = {}
+        self.dedup_stats = {}
+        # Subtitles passed through untranslated, and their characters
+        self.prefilter_stats = {}
+        # Journal of the running translation, and index of each subtitle in it
+        self._journal = None
+        self._positions = {}
+        # Languages and translator of the running translation, see save_backup
+        self._run_key = None
+        self.progress_callback = progress_callback
+
+        if store is not None:
+            # Already cleaned
+            self.subtitles = self._from_store(store)
+        else:
+            print(f"Loading {filepath} as {self.format}")
+            with events.phase("load", file=filepath):
+                with open(
+                    filepath, "r", encoding="utf-8", errors="ignore"
+                ) as input_file:
+                    self.subtitles = self.load_from_file(input_file)
+
+    @property
+    def _events(self) -> List:
+        """Subtitles of the file, in order"""
+        raise NotImplementedError
+
+    @staticmethod
+    def _text(sub) -> str:
+        raise NotImplementedError
+
+    @staticmethod
+    def _set_text(sub, text: str) -> None:
+        raise NotImplementedError
+
+    def load_from_file(self, input_file):
+        raise NotImplementedError
+
+    def _from_store(self, store: SubtitleStore):
+        raise NotImplementedError
+
+    def to_store(self) -> SubtitleStore:
+        """Subtitles of the file in a compact SubtitleStore, to keep them in memory"""
+        raise NotImplementedError
+
+    def _dump(self, filepath: str) -> None:
+        raise NotImplementedError
+
+    def wrap_lines(self, line_wrap_limit: int = 50) -> None:
+        raise NotImplementedError
+
+    @classmethod
+    def from_store(
+        cls,
+        filepath: str,
+        store: SubtitleStore,
+        progress_callback=show_progress,
+    ) -> "SubtitleFile":
+        """File with the subtitles of a store
+
+        Args:
+            filepath (str): file path of the subtitles
+            store (SubtitleStore): Subtitles, from to_store
+        """
+        return cls(filepath, progress_callback, store=store)
+
+    def for_language(self, destination_language: str) -> "SubtitleFile":
+        """Copy of the file to translate into another language, without loading it again
+
+        The copy has the cleaned text of this file, which is left untouched, and its
+        own journal (journals are kept by language), so several languages can be
+        translated at the same time.
+
+        Args:
+            destination_language (str): Language the copy will be translated into
+
+        Returns:
+            SubtitleFile: Copy to translate, of the same format
+        """
+        if len(self._translated) != 0:
+            raise ValueError(f"{self.filepath} is already translated, load it again")
+
+        return self.from_store(self.filepath, self.to_store(), self.progress_callback)
+
+    def _chunk_length(self, sub) -> int:
+        """Length of the subtitle text as it is sent to the translator"""
+        return len(self._text(sub))
+
+    def _chunk_lengths(self, subtitles: List) -> Iterator[int]:
+        """Length of each subtitle text, ready to be sent to the translator"""
+        return (len(self._text(sub)) for sub in subtitles)
+
+    def _get_next_chunk(
+        self,
+        chunk_size: int = 4500,
+        subtitles: Optional[List] = None,
+        max_lines: Optional[int] = None,
+        min_chunks: int = 1,
+    ) -> Generator:
+        """Get a portion of the subtitles at the time based on the chunk size
+
+        Args:
+            chunk_size (int, optional): Maximum number of letter in text chunk. Defaults to 4500.
+            subtitles (Optional[List], optional): Subtitles to split. Defaults to the ones not translated yet.
+            max_lines (Optional[int], optional): Maximum number of subtitles in chunk. Defaults to no limit.
+            min_chunks (int, optional): If more than 1, make at least this many chunks of similar size, to translate them in parallel. Defaults to 1.
+
+        Yields:
+            Generator: Each chunk at the time
+        """
+        if subtitles is None:
+            subtitles = self._events
+
+        lengths = self._chunk_lengths(subtitles)
+        if min_chunks > 1:
+            chunks = plan_balanced_chunks(
+                list(lengths), chunk_size, max_lines, min_chunks
+            )
+        else:
+            # Lengths are read lazily, while chunks are being translated
+            chunks = plan_chunks(lengths, chunk_size, max_lines)
+
+        for start, end in chunks:
+            yield subtitles[start:end]
+
+    def _translated_texts(self, subs_slice: List, translation: List[str]) -> List[str]:
+        """Translation of each subtitle in chunk, as it is written in the file"""
+        return translation
+
+    def _translate_chunk(
+        self,
+        translator: Translator,
+        subs_slice: List,
+        source_language: str,
+        destination_language: str,
+    ) -> List[str]:
+        """Translate a chunk of subtitles. It does not modify the subtitles, so it is safe to run on a thread
+
+        Returns:
+            List[str]: Translated text of each subtitle in chunk
+        """
+        translation = translator.translate_batch(
+            [self._text(sub) for sub in subs_slice],
+            source_language,
+            destination_language,
+        )
+        return self._translated_texts(subs_slice, translation)
+
+    async def _atranslate_chunk(
+        self,
+        translator: Translator,
+        subs_slice: List,
+        source_language: str,
+        destination_language: str,
+    ) -> List[str]:
+        """Same as _translate_chunk, but awaiting translator.translate_batch_async"""
+        translation = await translator.translate_batch_async(
+            [self._text(sub) for sub in subs_slice],
+            source_language,
+            destination_language,
+        )
+        return self._translated_texts(subs_slice, translation)
+
+    def _characters(self, subs_slice: List) -> int:
+        return sum(len(self._text(sub)) for sub in subs_slice)
+
+    def _write_chunk(self, subs_slice: List, translation: List[str]) -> None:
+        written = []
+        for i in range(len(subs_slice)):
+            # Repeated subtitles share the translation of the first one
+            for sub in [subs_slice[i], *self._duplicates.pop(id(subs_slice[i]), [])]:
+                self._set_text(sub, translation[i])
+                self._translated.add(id(sub))
+                written.append(sub)
+
+        if self._journal is not None:
+            self._journal.append(
+                (self._positions[id(sub)], self._text(sub)) for sub in written
+            )
+
+        # Only count subtitles translated without gaps
+        subtitles = self._events
+        while self.current_subtitle < len(subtitles) and (
+            id(subtitles[self.current_subtitle]) in self._translated
+        ):
+            self.current_subtitle += 1
+
+        self.progress_callback(len(subtitles), progress=self.current_subtitle)
+
+    def _open_journal(
+        self, translator: Translator, source_language: str, destination_language: str
+    ) -> None:
+        """Resume the translations journaled by a previous run and keep journaling"""
+        try:
+            journal = Journal(
+                journal_path(
+                    self.filepath,
+                    source_language,
+                    destination_language,
+                    translator_id(translator),
+                )
+            )
+            entries = journal.load()
+        except OSError:
+            logging.warning("Unable to use a journal, progress will not be saved")
+            return
+
+        subtitles = self._events
+        self._positions = {id(sub): i for i, sub in enumerate(subtitles)}
+
+        resumed = []
+        if self.resume:
+            resumed = [i for i in range(len(subtitles)) if i in entries]
+        else:
+            # Start over, without the translations of the previous run
+            journal.delete()
+        if len(resumed) != 0:
+            print(f"Journal found = {journal.path}")
+            print(f"Resuming {len(resumed)} translated subtitles")
+            self._write_chunk(
+                [subtitles[i] for i in resumed], [entries[i] for i in resumed]
+            )
+
+        self._journal = journal
+
+    def _close_journal(self) -> None:
+        if self._journal is not None:
+            self._journal.close()
+
+    def _prefilter(self, subtitles: List, skip: Iterable[str]) -> List:
+        """Write the subtitles that need no translation as they are
+
+        Returns:
+            List: Subtitles to translate
+        """
+        skip = tuple(skip)
+        pending, skipped, rules = prefilter(
+            subtitles, lambda sub: self._classify(sub, skip)
+        )
+        self.prefilter_stats = {
+            "subtitles": len(skipped),
+            "characters": self._characters(skipped),
+            "rules": rules,
+        }
+        if len(skipped) == 0:
+            return pending
+
+        self._write_chunk(skipped, [self._text(sub) for sub in skipped])
+        print(
+            f"... {len(skipped)} subtitles need no translation "
+            f"({', '.join(f'{rule} {count}' for rule, count in rules.items())}), "
+            f"saving {self.prefilter_stats['characters']} characters"
+        )
+        return pending
+
+    def _classify(self, sub, skip: Iterable[str]) -> Optional[str]:
+        return text_rule(self._text(sub), skip)
+
+    def _recall(
+        self,
+        subtitles: List,
+        translation_memory: Optional[TranslationMemory],
+        memory_key: Tuple[str, str, str],
+    ) -> Tuple[List, Dict[int, str]]:
+        """Write the translations already in memory
+
+        Returns:
+            Tuple[List, Dict[int, str]]: Subtitles still to translate and their source text by id
+        """
+        if translation_memory is None:
+            return subtitles, {}
+
+        found = translation_memory.get_many(
+            (self._text(sub) for sub in subtitles), *memory_key
+        )
+        pending = [sub for sub in subtitles if self._text(sub) not in found]
+        sources = {id(sub): self._text(sub) for sub in pending}
+
+        recalled = [sub for sub in subtitles if self._text(sub) in found]
+        if len(recalled) != 0:
+            self._write_chunk(recalled, [found[self._text(sub)] for sub in recalled])
+        print(f"... {len(recalled)} subtitles found in translation memory")
+
+        return pending, sources
+
+    def _deduplicate(self, subtitles: List, translator: Translator) -> List:
+        """Keep one subtitle per distinct text, _write_chunk copies its translation to the rest
+
+        Returns:
+            List: Subtitles to translate
+        """
+        unique, self._duplicates = deduplicate(subtitles, self._text)
+        lengths = {id(sub): self._chunk_length(sub) for sub in subtitles}
+        self.dedup_stats = dedup_stats(
+            [lengths[id(sub)] for sub in subtitles],
+            [lengths[id(sub)] for sub in unique],
+            translator.max_char,
+            translator.max_lines,
+        )
+
+        if self.dedup_stats["subtitles"] != 0:
+            print(
+                f"... {self.dedup_stats['subtitles']} repeated subtitles, saving "
+                f"{self.dedup_stats['characters']} characters and "
+                f"{self.dedup_stats['requests']} requests"
+            )
+
+        return unique
+
+    def _remember(
+        self,
+        translation_memory: Optional[TranslationMemory],
+        memory_key: Tuple[str, str, str],
+        sources: Dict[int, str],
+        subs_slice: List,
+        translation: List[str],
+    ) -> None:
+        if translation_memory is None:
+            return
+
+        translation_memory.put_many(
+            ((sources[id(sub)], line) for sub, line in zip(subs_slice, translation)),
+            *memory_key,
+        )
+
+    def _prepare(
+        self,
+        translation_memory: Optional[TranslationMemory],
+        memory_key: Tuple[str, str, str],
+        translator: Translator,
+        skip: Iterable[str] = RULES,
+    ) -> Tuple[List, Dict[int, str], int]:
+        """Subtitles left to translate after the prefilter, the translation memory and deduplication
+
+        Returns:
+            Tuple[List, Dict[int, str], int]: Subtitles to translate, their source text by id and their characters
+        """
+        pending = [sub for sub in self._events if id(sub) not in self._translated]
+        with events.phase("prefilter", file=self.filepath):
+            pending = self._prefilter(pending, skip)
+        with events.phase("recall", file=self.filepath):
+            pending, sources = self._recall(pending, translation_memory, memory_key)
+        with events.phase("dedup", file=self.filepath):
+            pending = self._deduplicate(pending, translator)
+
+        n_char = self._characters(pending)
+        events.emit(
+            "file_started",
+            file=self.filepath,
+            backend=memory_key[2],
+            subtitles=len(pending),
+            characters=n_char,
+            skipped_characters=self.prefilter_stats["characters"],
+        )
+        return pending, sources, n_char
+
+    def _start(
+        self,
+        translator: Translator,
+        source_language: str,
+        destination_language: str,
+        translation_memory: Optional[TranslationMemory],
+        journal: bool,
+        skip: Iterable[str],
+    ) -> Tuple[List, int, Callable[[List, List[str]], None]]:
+        """Open the journal and write every subtitle that needs no translator
+
+        Returns:
+            Tuple[List, int, Callable[[List, List[str]], None]]: Subtitles to translate, their characters, and the function writing the translation of a chunk of them
+        """
+        print("Starting translation")
+        memory_key = (source_language, destination_language, translator_id(translator))
+        self._run_key = memory_key
+        if journal:
+            self._open_journal(translator, source_language, destination_language)
+        pending, sources, n_char = self._prepare(
+            translation_memory, memory_key, translator, skip
+        )
+
+        def write(subs_slice: List, translation: List[str]) -> None:
+            self._write_chunk(subs_slice, translation)
+            self._remember(
+                translation_memory, memory_key, sources, subs_slice, translation
+            )
+
+        return pending, n_char, write
+
+    def _finish(
+        self, backend: str, n_subs: int, n_char: int, n_chunks: int, start: float
+    ) -> None:
+        seconds = time.perf_counter() - start
+        events.emit(
+            "file_finished",
+            file=self.filepath,
+            backend=backend,
+            subtitles=n_subs,
+            characters=n_char,
+            chunks=n_chunks,
+            seconds=seconds,
+            characters_per_second=n_char / max(seconds, 1e-9),
+        )
+        print(f"... Translation done")
+
+    def translate(
+        self,
+        translator: Translator,
+        source_language: str,
+        destination_language: str,
+        workers: int = 1,
+        translation_memory: Optional[TranslationMemory] = None,
+        journal: bool = True,
+        skip: Iterable[str] = RULES,
+    ) -> None:
+        """Translate the file using a translator of your choose
+
+        Args:
+            translator (Translator): Translator object of choose
+            destination_language (str): Destination language (must be coherent with your translator)
+            source_language (str): Source language (must be coherent with your translator)
+            workers (int, optional): Number of chunks translated at the same time. Capped by translator.max_workers. Defaults to 1.
+            translation_memory (Optional[TranslationMemory], optional): Cache of previous translations. Defaults to None.
+            journal (bool, optional): Write each translated chunk to a journal, to resume if the process dies. Defaults to True.
+            skip (Iterable[str], optional): Subtitles passed through untranslated, see prefilter.RULES. Defaults to all of them.
+        """
+        start = time.perf_counter()
+        workers = max(1, min(workers, translator.max_workers))
+        backend = translator_id(translator)
+        pending, n_char, write = self._start(
+            translator,
+            source_language,
+            destination_language,
+            translation_memory,
+            journal,
+            skip,
+        )
+
+        def translate_chunk(subs_slice):
+            return self._translate_chunk(
+                translator, subs_slice, source_language, destination_language
+            )
+
+        translate_chunk = events.chunk_events(
+            translate_chunk, self.filepath, backend, self._characters
+        )
+
+        # For each chunk of the file (based on the translator capabilities)
+        # Chunks may be translated concurrently, but results come back in subtitle order
+        chunks = self._get_next_chunk(
+            translator.max_char, pending, translator.max_lines, min_chunks=workers
+        )
+        n_chunks = 0
+        try:
+            with events.phase("translate", file=self.filepath):
+                for subs_slice, translation in ordered_map(
+                    translate_chunk, chunks, workers
+                ):
+                    write(subs_slice, translation)
+                    n_chunks += 1
+        finally:
+            self._close_journal()
+
+        self._finish(backend, len(pending), n_char, n_chunks, start)
+
+    async def atranslate(
+        self,
+        translator: Translator,
+        source_language: str,
+        destination_language: str,
+        translation_memory: Optional[TranslationMemory] = None,
+        journal: bool = True,
+        skip: Iterable[str] = RULES,
+    ) -> None:
+        """Translate the file without blocking the event loop
+
+        Every chunk is scheduled at once; translator.translate_async decides how many
+        run at the same time. Results are written back in subtitle order.
+
+        Args:
+            translator (Translator): Translator object of choose
+            destination_language (str): Destination language (must be coherent with your translator)
+            source_language (str): Source language (must be coherent with your translator)
+            translation_memory (Optional[TranslationMemory], optional): Cache of previous translations. Defaults to None.
+            journal (bool, optional): Write each translated chunk to a journal, to resume if the process dies. Defaults to True.
+            skip (Iterable[str], optional): Subtitles passed through untranslated, see prefilter.RULES. Defaults to all of them.
+        """
+        start = time.perf_counter()
+        backend = translator_id(translator)
+        pending, n_char, write = self._start(
+            translator,
+            source_language,
+            destination_language,
+            translation_memory,
+            journal,
+            skip,
+        )
+
+        async def translate_chunk(subs_slice):
+            return await self._atranslate_chunk(
+                translator, subs_slice, source_language, destination_language
+            )
+
+        translate_chunk = events.achunk_events(
+            translate_chunk, self.filepath, backend, self._characters
+        )
+
+        chunks = list(
+            self._get_next_chunk(
+                translator.max_char,
+                pending,
+                translator.max_lines,
+                min_chunks=translator.max_workers,
+            )
+        )
+        tasks = [
+            asyncio.ensure_future(translate_chunk(subs_slice)) for subs_slice in chunks
+        ]
+
+        try:
+            with events.phase("translate", file=self.filepath):
+                for subs_slice, task in zip(chunks, tasks):
+                    write(subs_slice, await task)
+        finally:
+            # Do not leave chunks translating if one of them failed
+            for task in tasks:
+                task.cancel()
+            self._close_journal()
+
+        self._finish(backend, len(pending), n_char, len(chunks), start)
+
+    def save_backup(self) -> None:
+        """Keep the subtitles translated so far in the journal, to resume from them
+
+        Translations with journal=True have them there already, chunk by chunk.
+        """
+        if self._journal is not None:
+            self._journal.close()
+            return
+        if self._run_key is None:
+            return
+
+        source_language, destination_language, backend = self._run_key
+        try:
+            journal = Journal(
+                journal_path(
+                    self.filepath, source_language, destination_language, backend
+                )
+            )
+            journal.append(
+                (i, self._text(sub))
+                for i, sub in enumerate(self._events)
+                if id(sub) in self._translated
+            )
+            journal.close()
+        except OSError:
+            logging.warning("Unable to write a journal, progress is lost")
+
+    def save(self, filepath: str) -> None:
+        """Saves the subtitles to a file
+
+        Args:
+            filepath (str): Path of the new file
+        """
+        # The translation is complete, so it no longer needs the journal
+        if self._journal is not None:
+            self._journal.delete()
+            self._journal = None
+
+        print(f"Saving {filepath}")
+        with events.phase("save", file=filepath):
+            self._dump(filepath)
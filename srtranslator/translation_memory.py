@@ -0,0 +1,207 @@
+import os
+import time
+import sqlite3
+import logging
+import threading
+
+from typing import Dict, Iterable, Optional, Tuple
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.split())
+
+
+def translator_id(translator) -> str:
+    """Name that identifies a translator backend in the translation memory"""
+    return getattr(translator, "id", type(translator).__name__)
+
+
+class TranslationMemory:
+    """Persistent cache of translated subtitle lines, stored in a SQLite database
+
+    Entries are keyed by the normalized line, the language pair and the translator.
+    The database runs in WAL mode, so several processes can share the same file.
+
+    Args:
+        filepath (Optional[str], optional): Database file. Defaults to ~/.cache/srtranslator/translation_memory.sqlite3
+        max_entries (Optional[int], optional): Maximum number of entries, least recently used are evicted first. Defaults to no limit.
+        max_age (Optional[float], optional): Seconds an entry is kept since it was last used. Defaults to no limit.
+    """
+
+    # SQLite limits the number of parameters in a query
+    _query_size = 500
+
+    def __init__(
+        self,
+        filepath: Optional[str] = None,
+        max_entries: Optional[int] = None,
+        max_age: Optional[float] = None,
+    ) -> None:
+        if filepath is None:
+            filepath = os.path.join(
+                os.path.expanduser("~"),
+                ".cache",
+                "srtranslator",
+                "translation_memory.sqlite3",
+            )
+
+        directory = os.path.dirname(filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.filepath = filepath
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            filepath, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            """CREATE TABLE IF NOT EXISTS translations (
+                source TEXT NOT NULL,
+                source_language TEXT NOT NULL,
+                destination_language TEXT NOT NULL,
+                translator TEXT NOT NULL,
+                translation TEXT NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (source, source_language, destination_language, translator)
+            ) WITHOUT ROWID"""
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS translations_last_used ON translations (last_used)"
+        )
+
+        self.evict()
+
+    def get_many(
+        self,
+        texts: Iterable[str],
+        source_language: str,
+        destination_language: str,
+        translator: str,
+    ) -> Dict[str, str]:
+        """Look up translations of several lines
+
+        Args:
+            texts (Iterable[str]): Lines to look up
+            source_language (str): Source language
+            destination_language (str): Destination language
+            translator (str): Translator id, see translator_id
+
+        Returns:
+            Dict[str, str]: Translation of each line found, by line as given
+        """
+        by_key = {}
+        for text in texts:
+            by_key.setdefault(_normalize(text), []).append(text)
+
+        keys = list(by_key)
+        found = {}
+        now = time.time()
+
+        with self._lock, self._connection:
+            self._connection.execute("BEGIN")
+            for i in range(0, len(keys), self._query_size):
+                batch = keys[i : i + self._query_size]
+                rows = self._connection.execute(
+                    f"""SELECT source, translation FROM translations
+                    WHERE source_language = ? AND destination_language = ? AND translator = ?
+                    AND source IN ({",".join("?" * len(batch))})""",
+                    (source_language, destination_language, translator, *batch),
+                ).fetchall()
+
+                for source, translation in rows:
+                    for text in by_key[source]:
+                        found[text] = translation
+
+                self._connection.executemany(
+                    """UPDATE translations SET last_used = ?
+                    WHERE source = ? AND source_language = ? AND destination_language = ? AND translator = ?""",
+                    (
+                        (now, source, source_language, destination_language, translator)
+                        for source, _ in rows
+                    ),
+                )
+
+            self.hits += len(found)
+            self.misses += sum(len(by_key[key]) for key in keys) - len(found)
+
+        return found
+
+    def put_many(
+        self,
+        translations: Iterable[Tuple[str, str]],
+        source_language: str,
+        destination_language: str,
+        translator: str,
+    ) -> None:
+        """Store translations of several lines
+
+        Args:
+            translations (Iterable[Tuple[str, str]]): Pairs of line and its translation
+            source_language (str): Source language
+            destination_language (str): Destination language
+            translator (str): Translator id, see translator_id
+        """
+        now = time.time()
+        rows = [
+            (
+                _normalize(text),
+                source_language,
+                destination_language,
+                translator,
+                translation,
+                now,
+            )
+            for text, translation in translations
+        ]
+
+        with self._lock, self._connection:
+            self._connection.execute("BEGIN")
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+
+    def evict(self) -> int:
+        """Delete entries older than max_age and the least recently used beyond max_entries
+
+        Returns:
+            int: Number of entries deleted
+        """
+        deleted = 0
+        with self._lock, self._connection:
+            self._connection.execute("BEGIN")
+            if self.max_age is not None:
+                deleted += self._connection.execute(
+                    "DELETE FROM translations WHERE last_used < ?",
+                    (time.time() - self.max_age,),
+                ).rowcount
+
+            if self.max_entries is not None:
+                deleted += self._connection.execute(
+                    """DELETE FROM translations WHERE last_used < (
+                        SELECT last_used FROM translations ORDER BY last_used DESC LIMIT 1 OFFSET ?
+                    )""",
+                    (self.max_entries - 1,),
+                ).rowcount
+
+        if deleted:
+            logging.info(f"Evicted {deleted} entries from translation memory")
+        return deleted
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            (entries,) = self._connection.execute(
+                "SELECT COUNT(*) FROM translations"
+            ).fetchone()
+
+        return {"entries": entries, "hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        self.evict()
+        self._connection.close()
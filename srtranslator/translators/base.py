@@ -1,8 +1,21 @@
+import time
+import asyncio
+import logging
+import functools
+
 from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from .. import events
+from ..translation_memory import translator_id
 
 
 class Translator(ABC):
     max_char: int
+    # Maximum number of chunks this translator can handle at the same time
+    max_workers: int = 1
+    # Maximum number of subtitles per chunk, if the translator has one
+    max_lines: Optional[int] = None
 
     @abstractmethod
     def translate(
@@ -10,6 +23,103 @@ class Translator(ABC):
     ) -> str:
         ...
 
+    def translate_batch(
+        self, texts: List[str], source_language: str, destination_language: str
+    ) -> List[str]:
+        """Translate several texts at once, one translation per text
+
+        By default texts are joined with break lines and the translation split back.
+        If the translator merges or drops lines, each text is translated on its own.
+        Override it if the translator has a native batch endpoint.
+        """
+        translation = self.translate(
+            "\n".join(texts), source_language, destination_language
+        )
+        if self._fits(texts, translation):
+            return translation.splitlines()
+
+        return [
+            self.translate(text, source_language, destination_language)
+            for text in texts
+        ]
+
+    def _fits(self, texts: List[str], translation: str) -> bool:
+        n_lines = len(translation.splitlines())
+        if n_lines == len(texts):
+            return True
+
+        logging.warning(
+            f"Got {n_lines} lines translating {len(texts)}. "
+            "Translating them one by one"
+        )
+        return False
+
+    async def translate_async(
+        self, text: str, source_language: str, destination_language: str
+    ) -> str:
+        """Translate without blocking the event loop
+
+        Translators without a native async client run translate in a thread,
+        with at most max_workers calls at the same time. Override it to use a real async client.
+        """
+        return await self._run_in_thread(
+            self.translate, text, source_language, destination_language
+        )
+
+    async def translate_batch_async(
+        self, texts: List[str], source_language: str, destination_language: str
+    ) -> List[str]:
+        """Same as translate_batch without blocking the event loop"""
+        cls = type(self)
+        if (
+            cls.translate_batch is Translator.translate_batch
+            and cls.translate_async is not Translator.translate_async
+        ):
+            # Native async translate but no batch endpoint, join texts as translate_batch
+            translation = await self.translate_async(
+                "\n".join(texts), source_language, destination_language
+            )
+            if self._fits(texts, translation):
+                return translation.splitlines()
+
+            return await asyncio.gather(
+                *(
+                    self.translate_async(text, source_language, destination_language)
+                    for text in texts
+                )
+            )
+
+        return await self._run_in_thread(
+            self.translate_batch, texts, source_language, destination_language
+        )
+
+    async def _run_in_thread(self, func, *args):
+        async with self._get_async_limit():
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(None, functools.partial(func, *args))
+
+    def _get_async_limit(self) -> asyncio.Semaphore:
+        # Semaphores are bound to an event loop, so create one per running loop
+        loop = asyncio.get_event_loop()
+        async_limit = getattr(self, "_async_limit", None)
+        if async_limit is None or async_limit[0] is not loop:
+            async_limit = (loop, asyncio.Semaphore(self.max_workers))
+            self._async_limit = async_limit
+        return async_limit[1]
+
+    def _emit_request(
+        self, characters: int, start: float, attempt: int = 1, success: bool = True
+    ) -> None:
+        """Emit a request event for a call to the service started at start (perf_counter)"""
+        events.emit(
+            "request",
+            backend=translator_id(self),
+            characters=characters,
+            latency=time.perf_counter() - start,
+            attempt=attempt,
+            success=success,
+        )
+
     def quit(self):
         ...
 
@@ -1,15 +1,43 @@
+import time
 import deepl
+from typing import List, Optional
 from .base import Translator
 
 
 class DeeplApi(Translator):
-    max_char = 1500
+    # A request takes up to 50 texts and 128 KiB. Characters take up to 4 bytes in
+    # UTF-8 (3 for CJK), so 30k characters stay below it in any language
+    max_char = 30000
+    max_lines = 50
+    max_workers = 4
 
-    def __init__(self, api_key):
-        self.translator = deepl.Translator(api_key)
+    def __init__(self, api_key, server_url: Optional[str] = None):
+        # server_url points it to another server with the same API, like a local mock
+        self.translator = deepl.Translator(api_key, server_url=server_url)
 
     def translate(self, text: str, source_language: str, destination_language: str):
-        result = self.translator.translate_text(
-            text, source_lang=source_language, target_lang=destination_language
+        result = self._translate_text(
+            text, len(text), source_language, destination_language
         )
         return result.text
+
+    def translate_batch(
+        self, texts: List[str], source_language: str, destination_language: str
+    ) -> List[str]:
+        results = self._translate_text(
+            texts, sum(map(len, texts)), source_language, destination_language
+        )
+        return [result.text for result in results]
+
+    def _translate_text(self, text, characters, source_language, destination_language):
+        start = time.perf_counter()
+        try:
+            result = self.translator.translate_text(
+                text, source_lang=source_language, target_lang=destination_language
+            )
+        except Exception:
+            self._emit_request(characters, start, success=False)
+            raise
+
+        self._emit_request(characters, start)
+        return result
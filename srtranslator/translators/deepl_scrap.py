@@ -1,12 +1,17 @@
 import time
+import queue
 import logging
+import threading
 
-from typing import Optional
+from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.common.proxy import Proxy
-from selenium.webdriver.common.keys import Keys
 
+from .. import events
+from ..translation_memory import translator_id
 from .base import Translator, TimeOutException
+from .proxy_pool import ban_proxy, report_proxy
 from .selenium_utils import (
     create_proxy,
     create_driver,
@@ -58,9 +63,30 @@ class DeeplTranslator(Translator):
         "uk": "Ukrainian",
     }
 
-    def __init__(self, driver: Optional[WebDriver] = None):
+    def __init__(
+        self,
+        driver: Optional[WebDriver] = None,
+        timeout: float = 60,
+        stable_time: float = 0.5,
+        poll_interval: float = 0.1,
+    ):
+        """
+        Args:
+            driver (Optional[WebDriver], optional): Selenium WebDriver. Defaults to a new one with a proxy.
+            timeout (float, optional): Seconds to wait for a translation before rotating the proxy. Defaults to 60.
+            stable_time (float, optional): Seconds the translation must stay the same to be considered done. Defaults to 0.5.
+            poll_interval (float, optional): Seconds between checks of the translation. Defaults to 0.1.
+        """
         self.last_translation_failed = False
         self.driver = driver
+        self.proxy_address = None
+        self.timeout = timeout
+        self.stable_time = stable_time
+        self.poll_interval = poll_interval
+        # Times the proxy was rotated because a translation failed
+        self.bans = 0
+        # Seconds waited for each translated chunk
+        self.wait_times = []
 
         if self.driver is None:
             self._rotate_proxy()
@@ -88,11 +114,17 @@ class DeeplTranslator(Translator):
         if self.driver is not None:
             logging.info(" ======= Translation failed. Probably got banned. ======= ")
             logging.info("Rotating proxy")
+            self.bans += 1
+            ban_proxy(self.proxy_address)
             self.quit()
 
         proxy = create_proxy()
+        self.proxy_address = proxy.http_proxy
         self.driver = create_driver(proxy)
         self._reset()
+        events.emit(
+            "proxy_rotated", backend=translator_id(self), proxy=self.proxy_address
+        )
 
     def _closePopUp(self):
         Button(
@@ -133,6 +165,44 @@ class DeeplTranslator(Translator):
             and original != translation
         )
 
+    @events.phase("wait_translation")
+    def _wait_translation(self, text: str, stale: str = "") -> Optional[str]:
+        """Wait until the translation is complete and has not changed for stable_time
+
+        Args:
+            text (str): Text written in the input
+            stale (str, optional): Text left in the output before writing the input, if it could not be cleared. Defaults to "".
+
+        Returns:
+            Optional[str]: Translation, or None if it timed out
+        """
+        start = time.time()
+        previous = None
+        changed_at = start
+
+        while time.time() - start < self.timeout:
+            translation = self.input_destination_language.value
+            now = time.time()
+
+            if translation != previous:
+                previous = translation
+                changed_at = now
+            elif (
+                now - changed_at >= self.stable_time
+                and self._is_translated(text, translation)
+                # Only if the output could not be cleared, the previous translation
+                # may still be there
+                and (stale == "" or translation != stale)
+            ):
+                self.wait_times.append(now - start)
+                report_proxy(self.proxy_address, True, now - start)
+                logging.debug(f"Translation ready after {now - start:.2f}s")
+                return translation
+
+            time.sleep(self.poll_interval)
+
+        return None
+
     def translate(self, text: str, source_language: str, destination_language: str):
         if source_language != self.src_lang:
             self._set_source_language(source_language)
@@ -141,20 +211,19 @@ class DeeplTranslator(Translator):
 
         clean_text = text.replace("[...]", "@[.]@")
 
-        self.input_lang_from.write((clean_text.replace("\n", Keys.ENTER)))
+        start = time.perf_counter()
+        attempt = 2 if self.last_translation_failed else 1
+        # Empty the output first, so a translation equal to the previous one is
+        # seen as soon as it is there
+        stale = self.input_destination_language.clear()
+        self.input_lang_from.write(clean_text)
 
-        # Maximun number of iterations 60 seconds
-        for _ in range(60):
-            translation = self.input_destination_language.value
-
-            if self._is_translated(clean_text, translation):
-                time.sleep(2)
-                translation = self.input_destination_language.value
-
-                # Reset the proxy flag
-                self.last_translation_failed = False
-                return translation.replace("@[.]@", "[...]")
-            time.sleep(1)
+        translation = self._wait_translation(clean_text, stale)
+        self._emit_request(len(text), start, attempt, success=translation is not None)
+        if translation is not None:
+            # Reset the proxy flag
+            self.last_translation_failed = False
+            return translation.replace("@[.]@", "[...]")
 
         # Maybe proxy got banned, so we try with a new proxy, but just once.
         if not self.last_translation_failed:
@@ -167,3 +236,135 @@ class DeeplTranslator(Translator):
 
     def quit(self):
         self.driver.quit()
+
+
+# Tries to launch a new browser for a session that timed out, before dropping it
+RESTART_ATTEMPTS = 2
+
+
+class DeeplTranslatorPool(Translator):
+    """Several DeeplTranslator sessions (each one a browser with its own proxy) translating in parallel
+
+    Each chunk goes to an idle session. When a session gets banned only that one rotates its proxy.
+    A session whose browser can not be launched again is dropped from the pool.
+
+    Args:
+        size (int, optional): Number of browser sessions. Defaults to 2.
+        **kwargs: DeeplTranslator options (timeout, stable_time, poll_interval) for every session
+    """
+
+    max_char = DeeplTranslator.max_char
+    languages = DeeplTranslator.languages
+
+    def __init__(self, size: int = 2, **kwargs):
+        self.max_workers = size
+        self._session_options = kwargs
+        self._lock = threading.Lock()
+        self._idle = queue.Queue()
+        # Sessions without a browser, never given a chunk again
+        self._dropped = set()
+        self._stats = [
+            {"chunks": 0, "characters": 0, "seconds": 0.0, "failures": 0}
+            for _ in range(size)
+        ]
+
+        # Launch every browser at the same time
+        with ThreadPoolExecutor(max_workers=size) as executor:
+            self._sessions = list(
+                executor.map(
+                    lambda _: DeeplTranslator(**self._session_options), range(size)
+                )
+            )
+
+        for session_id in range(size):
+            self._idle.put(session_id)
+
+    def translate(self, text: str, source_language: str, destination_language: str):
+        session_id = self._idle.get()
+        if session_id is None:
+            # Every session was dropped, let the other chunks know too
+            self._idle.put(None)
+            raise Exception("No browser session left in the pool")
+
+        session = self._sessions[session_id]
+        start = time.time()
+        timed_out = False
+
+        try:
+            translation = session.translate(
+                text, source_language, destination_language
+            )
+        except TimeOutException:
+            timed_out = True
+            with self._lock:
+                self._stats[session_id]["failures"] += 1
+            raise
+        finally:
+            with self._lock:
+                self._stats[session_id]["seconds"] += time.time() - start
+            if timed_out:
+                # The session quit its browser, replace it before giving it back
+                self._restart(session_id)
+            else:
+                self._idle.put(session_id)
+
+        with self._lock:
+            self._stats[session_id]["chunks"] += 1
+            self._stats[session_id]["characters"] += len(text)
+
+        return translation
+
+    def _restart(self, session_id: int) -> None:
+        """Give a session back with a new browser, or drop it if none can be launched"""
+        session = self._sessions[session_id]
+        for attempt in range(1, RESTART_ATTEMPTS + 1):
+            try:
+                self._sessions[session_id] = self._replace(session)
+            except Exception as e:
+                logging.warning(
+                    f"Unable to launch browser {session_id + 1} (attempt {attempt}): {e}"
+                )
+                continue
+
+            self._idle.put(session_id)
+            return
+
+        with self._lock:
+            self._dropped.add(session_id)
+            left = len(self._sessions) - len(self._dropped)
+        logging.warning(f"Browser {session_id + 1} dropped, {left} left in the pool")
+        if left == 0:
+            self._idle.put(None)
+
+    def _replace(self, session: DeeplTranslator) -> DeeplTranslator:
+        new_session = DeeplTranslator(**self._session_options)
+        new_session.bans = session.bans
+        new_session.wait_times = session.wait_times
+        return new_session
+
+    def stats(self) -> Dict:
+        """Pool size, and per session chunks, characters, throughput and bans"""
+        with self._lock:
+            sessions = []
+            for session_id, (session, stats) in enumerate(
+                zip(self._sessions, self._stats)
+            ):
+                sessions.append(
+                    {
+                        **stats,
+                        "dropped": session_id in self._dropped,
+                        "characters_per_second": stats["characters"]
+                        / max(stats["seconds"], 1e-9),
+                        "bans": session.bans,
+                        "average_wait": sum(session.wait_times)
+                        / max(len(session.wait_times), 1),
+                    }
+                )
+
+        return {"size": len(self._sessions), "sessions": sessions}
+
+    def quit(self):
+        for session_id, session in enumerate(self._sessions):
+            # Dropped sessions have quit their browser already
+            if session_id not in self._dropped:
+                session.quit()
@@ -0,0 +1,220 @@
+import time
+import logging
+import threading
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional
+
+from .. import events
+from ..translation_memory import translator_id
+from .base import Translator
+
+# Seconds between tries to hedge a chunk while every other translator is busy
+BUSY_RETRY = 0.05
+
+
+class HedgedTranslator(Translator):
+    """Several translators in order of preference, working as one
+
+    Each chunk goes to the first translator. If it takes longer than usual (its
+    latency percentile) the same chunk is also sent to the next one, and the first
+    translation to arrive wins. If a translator fails, the next one takes over.
+    A translator without a free worker (still busy with a chunk it lost...) gets
+    the chunk once it has one, so translators that are not thread safe (a browser)
+    never get two chunks at once.
+
+    Args:
+        translators (List[Translator]): Translators, the preferred one first
+        percentile (float, optional): Latency percentile of a translator after which the chunk is hedged. Defaults to 0.9.
+        hedge_after (float, optional): Seconds before hedging while there are less than min_samples latencies. Defaults to 10.
+        min_samples (int, optional): Latencies needed to use the percentile. Defaults to 5.
+        window (int, optional): Latencies kept per translator. Defaults to 100.
+    """
+
+    def __init__(
+        self,
+        translators: List[Translator],
+        percentile: float = 0.9,
+        hedge_after: float = 10,
+        min_samples: int = 5,
+        window: int = 100,
+    ):
+        if len(translators) == 0:
+            raise ValueError("HedgedTranslator needs at least one translator")
+
+        self.translators = translators
+        self.percentile = percentile
+        self.hedge_after = hedge_after
+        self.min_samples = min_samples
+
+        self.id = "hedged:" + ",".join(translator_id(t) for t in translators)
+        # Chunks must fit any of them
+        self.max_char = min(translator.max_char for translator in translators)
+        limits = [t.max_lines for t in translators if t.max_lines is not None]
+        self.max_lines = min(limits) if limits else None
+        self.max_workers = translators[0].max_workers
+
+        self._lock = threading.Lock()
+        self._busy = [threading.Semaphore(t.max_workers) for t in translators]
+        self._latencies = [deque(maxlen=window) for _ in translators]
+        self._stats = [
+            {"served": 0, "hedged": 0, "failures": 0, "late": 0} for _ in translators
+        ]
+        self._executor = ThreadPoolExecutor(
+            max_workers=sum(t.max_workers for t in translators)
+        )
+
+    def translate(self, text: str, source_language: str, destination_language: str):
+        return self._hedge(
+            lambda translator: translator.translate(
+                text, source_language, destination_language
+            ),
+            len(text),
+        )
+
+    def translate_batch(
+        self, texts: List[str], source_language: str, destination_language: str
+    ) -> List[str]:
+        return self._hedge(
+            lambda translator: translator.translate_batch(
+                texts, source_language, destination_language
+            ),
+            sum(map(len, texts)),
+        )
+
+    def _hedge_delay(self, index: int) -> float:
+        with self._lock:
+            latencies = sorted(self._latencies[index])
+        if len(latencies) < self.min_samples:
+            return self.hedge_after
+        return latencies[min(int(self.percentile * len(latencies)), len(latencies) - 1)]
+
+    def _submit(self, index: int, call: Callable, block: bool = False):
+        """Start call on a translator, if it has a free worker. Returns its future"""
+        if not self._busy[index].acquire(blocking=block):
+            return None
+
+        def run():
+            start = time.perf_counter()
+            try:
+                result = call(self.translators[index])
+            finally:
+                self._busy[index].release()
+
+            with self._lock:
+                self._latencies[index].append(time.perf_counter() - start)
+            return result
+
+        return self._executor.submit(run)
+
+    def _hedge(self, call: Callable, characters: int):
+        start = time.perf_counter()
+        # Running future -> (translator index, start time)
+        running = {}
+        failovers = 0
+        error = None
+        # Translators not tried yet, in order of preference. One busy when its turn
+        # came stays here, to be hedged or failed over to once it is free
+        untried = list(range(len(self.translators)))
+        # When to try again to hedge, if every untried translator was busy
+        retry_at = 0
+
+        def start_next(block: bool = False) -> bool:
+            for index in untried[:1] if block else list(untried):
+                future = self._submit(index, call, block=block)
+                if future is not None:
+                    untried.remove(index)
+                    running[future] = (index, time.perf_counter())
+                    return True
+            return False
+
+        def start_or_wait() -> None:
+            # If every translator left is busy, wait for the first of them
+            if not start_next():
+                start_next(block=True)
+
+        start_or_wait()
+
+        while running:
+            timeout = None
+            if untried:
+                deadline = min(
+                    started + self._hedge_delay(index)
+                    for index, started in running.values()
+                )
+                timeout = max(max(deadline, retry_at) - time.perf_counter(), 0)
+
+            done, _ = wait(list(running), timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                # Too slow, ask the next translator too
+                if start_next():
+                    index, _ = running[list(running)[-1]]
+                    with self._lock:
+                        self._stats[index]["hedged"] += 1
+                else:
+                    retry_at = time.perf_counter() + BUSY_RETRY
+                continue
+
+            for future in done:
+                index, _ = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logging.warning(f"{translator_id(self.translators[index])}: {e}")
+                    with self._lock:
+                        self._stats[index]["failures"] += 1
+                    failovers += 1
+                    error = e
+                    continue
+
+                self._served(index, running, characters, start, failovers)
+                return result
+
+            # Every running translator failed, fail over to the next one
+            if not running:
+                start_or_wait()
+
+        raise error if error is not None else Exception("No translator available")
+
+    def _served(self, index, running, characters, start, failovers) -> None:
+        with self._lock:
+            self._stats[index]["served"] += 1
+            for other, _ in running.values():
+                self._stats[other]["late"] += 1
+
+        events.emit(
+            "hedge",
+            backend=translator_id(self),
+            served_by=translator_id(self.translators[index]),
+            characters=characters,
+            latency=time.perf_counter() - start,
+            hedged=len(running) != 0,
+            failovers=failovers,
+        )
+
+    def stats(self) -> Dict:
+        """By translator: chunks served, received as a hedge, failed and finished too late"""
+        with self._lock:
+            return {
+                # The same translator can be used twice (two api keys...)
+                f"{index + 1}:{translator_id(translator)}": {
+                    **stats,
+                    "p50": self._percentile_of(index, 0.5),
+                    "p90": self._percentile_of(index, 0.9),
+                }
+                for index, (translator, stats) in enumerate(
+                    zip(self.translators, self._stats)
+                )
+            }
+
+    def _percentile_of(self, index: int, percentile: float) -> Optional[float]:
+        latencies = sorted(self._latencies[index])
+        if not latencies:
+            return None
+        return latencies[min(int(percentile * len(latencies)), len(latencies) - 1)]
+
+    def quit(self):
+        self._executor.shutdown(wait=False)
+        for translator in self.translators:
+            translator.quit()
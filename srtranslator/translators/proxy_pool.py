@@ -0,0 +1,266 @@
+import time
+import random
+import logging
+import threading
+import requests
+
+from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from fp.fp import FreeProxy
+
+from .. import events
+
+
+class ProxyStats:
+    """Latency and success rate of a proxy"""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.successes = 0
+        self.failures = 0
+
+    @property
+    def score(self) -> float:
+        # Success rate with a prior of 1 success in 2 uses, per second of latency
+        success_rate = (self.successes + 1) / (self.successes + self.failures + 2)
+        return success_rate / max(self.latency, 1e-3)
+
+    def record(self, latency: Optional[float], success: bool) -> None:
+        if success:
+            self.successes += 1
+        else:
+            self.failures += 1
+
+        if latency is not None:
+            # Exponential moving average, recent uses weight more
+            self.latency = 0.7 * self.latency + 0.3 * latency
+
+
+class ProxyPool:
+    """Free proxies checked in background, so a working one is ready when needed
+
+    A background thread scrapes proxy lists with FreeProxy and checks candidates
+    in parallel until there are `size` working ones. get returns the best one by
+    success rate and latency. Banned proxies are quarantined for a while, and
+    candidates that fail the check are not checked again for failed_time seconds.
+    When a refill finds no working candidate (offline...), the lists are scraped
+    less and less often, up to every max_retry_delay seconds.
+
+    Args:
+        country_id (Optional[List[str]], optional): Countries of the proxies. Defaults to any.
+        size (int, optional): Number of working proxies to keep ready. Defaults to 5.
+        check_url (str, optional): Url requested to check a proxy. Defaults to "http://www.google.com".
+        check_timeout (float, optional): Seconds a proxy has to answer the check. Defaults to 2.
+        quarantine_time (float, optional): Seconds a banned proxy is not used. Defaults to 1800.
+        failed_time (float, optional): Seconds a candidate that failed the check is not checked again. Defaults to 600.
+        max_retry_delay (float, optional): Maximum seconds between refills finding no working candidate. Defaults to 300.
+    """
+
+    def __init__(
+        self,
+        country_id: Optional[List[str]] = None,
+        size: int = 5,
+        check_url: str = "http://www.google.com",
+        check_timeout: float = 2,
+        quarantine_time: float = 1800,
+        failed_time: float = 600,
+        max_retry_delay: float = 300,
+    ) -> None:
+        self.country_id = country_id
+        self.size = size
+        self.check_url = check_url
+        self.check_timeout = check_timeout
+        self.quarantine_time = quarantine_time
+        self.failed_time = failed_time
+        self.max_retry_delay = max_retry_delay
+
+        self._proxies: Dict[str, ProxyStats] = {}
+        self._quarantine: Dict[str, float] = {}
+        # Candidates that failed the check, until when they are not checked again
+        self._failed: Dict[str, float] = {}
+        self._condition = threading.Condition()
+        self._thread = None
+        self._closed = False
+
+    @events.phase("proxy")
+    def get(self, timeout: float = 60) -> str:
+        """Best working proxy, waiting for the background checks if there is none yet
+
+        Args:
+            timeout (float, optional): Seconds to wait for a working proxy. Defaults to 60.
+
+        Returns:
+            str: Proxy address as http://ip:port
+        """
+        self._start()
+
+        deadline = time.time() + timeout
+        with self._condition:
+            while len(self._proxies) == 0:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise Exception("Unable to get proxy")
+
+                self._condition.wait(remaining)
+
+            return max(self._proxies, key=lambda proxy: self._proxies[proxy].score)
+
+    def report(self, proxy: str, success: bool, latency: Optional[float] = None):
+        """Record how a request through the proxy went"""
+        with self._condition:
+            if proxy in self._proxies:
+                self._proxies[proxy].record(latency, success)
+
+    def ban(self, proxy: Optional[str]) -> None:
+        """Stop using a proxy for quarantine_time seconds, and find a replacement"""
+        if proxy is None:
+            return
+
+        logging.info(f"Proxy {proxy} quarantined")
+        with self._condition:
+            self._proxies.pop(proxy, None)
+            self._quarantine[proxy] = time.time() + self.quarantine_time
+            self._condition.notify_all()
+
+    def stats(self) -> Dict[str, Tuple[float, int, int]]:
+        """Latency, successes and failures of each working proxy"""
+        with self._condition:
+            return {
+                proxy: (stats.latency, stats.successes, stats.failures)
+                for proxy, stats in self._proxies.items()
+            }
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def _start(self) -> None:
+        with self._condition:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._fill, daemon=True)
+                self._thread.start()
+
+    def _fill(self) -> None:
+        retry_delay = self.check_timeout
+        with ThreadPoolExecutor(max_workers=self.size * 2) as executor:
+            while True:
+                with self._condition:
+                    while not self._closed and len(self._proxies) >= self.size:
+                        self._condition.wait()
+
+                    if self._closed:
+                        return
+
+                    now = time.time()
+                    self._quarantine = {
+                        proxy: until
+                        for proxy, until in self._quarantine.items()
+                        if until > now
+                    }
+                    self._failed = {
+                        proxy: until
+                        for proxy, until in self._failed.items()
+                        if until > now
+                    }
+                    excluded = {*self._quarantine, *self._failed, *self._proxies}
+
+                candidates = [
+                    candidate
+                    for candidate in self._get_candidates()
+                    if candidate not in excluded
+                ]
+
+                # Check a few more than needed, some of them will not work
+                random.shuffle(candidates)
+                candidates = candidates[: self.size * 4]
+                working = False
+                for candidate, latency in zip(
+                    candidates, executor.map(self._check, candidates)
+                ):
+                    with self._condition:
+                        if latency is None:
+                            self._failed[candidate] = time.time() + self.failed_time
+                            continue
+
+                        working = True
+                        if len(self._proxies) >= self.size:
+                            break
+
+                        self._proxies[candidate] = ProxyStats(latency)
+                        self._condition.notify_all()
+
+                if working:
+                    retry_delay = self.check_timeout
+                    continue
+
+                logging.info(f"No working proxy found, retrying in {retry_delay:.0f}s")
+                self._sleep(retry_delay)
+                retry_delay = min(retry_delay * 2, self.max_retry_delay)
+
+    def _sleep(self, seconds: float) -> None:
+        """Wait, unless the pool is closed in the meantime"""
+        deadline = time.time() + seconds
+        with self._condition:
+            while not self._closed and time.time() < deadline:
+                self._condition.wait(deadline - time.time())
+
+    def _get_candidates(self) -> List[str]:
+        logging.info("Getting proxy candidates from https://www.sslproxies.org/")
+        free_proxy = FreeProxy(country_id=self.country_id)
+        try:
+            candidates = free_proxy.get_proxy_list(repeat=False)
+            if len(candidates) == 0 and self.country_id is not None:
+                candidates = free_proxy.get_proxy_list(repeat=True)
+        except Exception:
+            logging.info("Exception while getting proxy candidates")
+            return []
+
+        return [f"http://{candidate}" for candidate in candidates]
+
+    def _check(self, proxy: str) -> Optional[float]:
+        """Seconds the proxy takes to answer, or None if it does not work"""
+        start = time.time()
+        try:
+            response = requests.get(
+                self.check_url,
+                proxies={"http": proxy, "https": proxy},
+                timeout=self.check_timeout,
+            )
+            response.raise_for_status()
+        except Exception:
+            return None
+
+        return time.time() - start
+
+
+_pools: Dict[Tuple[str, ...], ProxyPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_proxy_pool(country_id: Optional[List[str]] = None) -> ProxyPool:
+    """Proxy pool shared by every translator using proxies of these countries"""
+    key = tuple(country_id or ())
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = ProxyPool(country_id=country_id)
+        return _pools[key]
+
+
+def report_proxy(proxy: Optional[str], success: bool, latency: Optional[float] = None):
+    """Record how a request through the proxy went, in the pools that handed it out"""
+    if proxy is None:
+        return
+
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.report(proxy, success, latency)
+
+
+def ban_proxy(proxy: Optional[str]) -> None:
+    """Quarantine a proxy in every pool"""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.ban(proxy)
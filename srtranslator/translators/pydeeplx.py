@@ -1,54 +1,92 @@
+import requests
+
 from PyDeepLX import PyDeepLX as PDLX
-from random import randint
-from time import sleep
+from time import time, perf_counter
 
+from .. import events
+from ..translation_memory import translator_id
 from .base import Translator as BaseTranslator
-from fp.fp import FreeProxy
+from .proxy_pool import ban_proxy, get_proxy_pool, report_proxy
+from .rate_limiter import RateLimiter, default_rate_limits_path
+
+# Shared by every PyDeepLX translator, in this and other processes.
+# 3 requests at once, then one every 5 seconds (up to 40 if DeepL throttles)
+rate_limiter = RateLimiter(
+    "pydeeplx",
+    rate=1 / 5,
+    burst=3,
+    jitter=1,
+    path=default_rate_limits_path(),
+    max_backoff=8,
+)
+
+
+def throttled(error: Exception) -> bool:
+    """If the backend asked to slow down (429) or is overloaded (5xx)
+
+    Connection and proxy errors are not, changing the proxy is enough for them.
+    """
+    if isinstance(error, PDLX.TooManyRequestsException):
+        return True
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    return status is not None and (status == 429 or status >= 500)
 
 
 class PyDeepLX(BaseTranslator):
     max_char = 1500
 
-    def __init__(self, proxies=None):
+    def __init__(self, proxies=None, server_url=None, limiter=None):
         self.proxies = proxies
+        # A DeepLX server (self hosted, or a local mock) instead of DeepL web API
+        self.server_url = server_url
+        self.rate_limiter = limiter or rate_limiter
 
         # Use proxy by default if self.proxies is True
         if self.proxies:
             print("...... Use proxy")
-            self.proxies = FreeProxy(rand=True, timeout=1).get()
+            self.proxies = get_proxy_pool().get()
 
     def translate(self, text, source_language, destination_language):
-        # Sleep a random number of seconds (between 5 and 10)
-        # https://www.shellhacks.com/python-sleep-random-time-web-scraping/
-        RANDOM_WAIT = randint(5, 10)
-        print(f"...... Wait randomly {RANDOM_WAIT}s")
-        sleep(RANDOM_WAIT)
+        waited = self.rate_limiter.acquire()
+        if waited:
+            print(f"...... Waited {waited:.1f}s for the rate limit")
+            events.emit("rate_limited", backend=translator_id(self), waited=waited)
 
         # Max retry 10
         RETRY_COUNTER = 10
         result = None
 
         while RETRY_COUNTER > 0 :
+            attempt = 11 - RETRY_COUNTER
+            request_start = perf_counter()
             try:
-                result = PDLX.translate(
-                    text,
-                    source_language,
-                    destination_language,
-                    proxies=self.proxies
-                )
+                start = time()
+                result = self._request(text, source_language, destination_language)
 
                 if result == None:
                   print("...... Exception: result is empty raise exception")
                   raise Exception("Result is empty")
 
                 # Everyting alright
+                self._emit_request(len(text), request_start, attempt)
+                report_proxy(self.proxies, True, time() - start)
+                self.rate_limiter.report_success()
                 break
             except Exception as e:
                 print(f"...... Exception {e} with retry number {RETRY_COUNTER}")
+                self._emit_request(len(text), request_start, attempt, success=False)
+                if throttled(e):
+                    self.rate_limiter.report_failure()
 
-                # Get a random proxy
-                print("...... Use or change proxy")
-                self.proxies = FreeProxy(rand=True, timeout=1).get()
+                # Get the best proxy from the pool. A DeepLX server does not ban
+                # clients, so it only uses proxies if asked to
+                if self.server_url is None or self.proxies:
+                    print("...... Use or change proxy")
+                    ban_proxy(self.proxies)
+                    self.proxies = get_proxy_pool().get()
+                    events.emit(
+                        "proxy_rotated", backend=translator_id(self), proxy=self.proxies
+                    )
 
                 # Decrease RETRY_COUNTER
                 RETRY_COUNTER -= 1
@@ -58,4 +96,32 @@ class PyDeepLX(BaseTranslator):
                     print("...... Exception RETRY_COUNTER reached 0")
                     raise
 
+                waited = self.rate_limiter.acquire()
+                if waited:
+                    events.emit(
+                        "rate_limited", backend=translator_id(self), waited=waited
+                    )
+
         return result
+
+    def _request(self, text, source_language, destination_language):
+        if self.server_url is None:
+            return PDLX.translate(
+                text, source_language, destination_language, proxies=self.proxies
+            )
+
+        proxies = None
+        if self.proxies:
+            proxies = {"http": self.proxies, "https": self.proxies}
+        response = requests.post(
+            f"{self.server_url.rstrip('/')}/translate",
+            json={
+                "text": text,
+                "source_lang": source_language,
+                "target_lang": destination_language,
+            },
+            proxies=proxies,
+            timeout=30,
+        )
+        response.raise_for_status()
+        return response.json().get("data")
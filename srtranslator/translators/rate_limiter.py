@@ -0,0 +1,156 @@
+import os
+import time
+import random
+import sqlite3
+import logging
+import threading
+
+from typing import Optional, Tuple
+
+
+def default_rate_limits_path() -> str:
+    return os.path.join(
+        os.path.expanduser("~"), ".cache", "srtranslator", "rate_limits.sqlite3"
+    )
+
+
+class RateLimiter:
+    """Token bucket to space requests to a backend
+
+    Requests go through at once while there are tokens, and tokens refill at `rate`
+    per second up to `burst`. Each failure halves the refill rate (up to
+    max_backoff times slower), and each success brings it back up. Report only
+    the failures that ask to slow down (429, 5xx): a dead proxy is not a reason to.
+    The slow down also wears off with time, every `recovery` seconds it halves, so
+    the one saved by a previous run does not last.
+
+    With a path, the bucket lives in a SQLite file, so every process using the same
+    backend shares it. Without one, it is shared by the threads of this process.
+
+    Args:
+        name (str): Backend name, buckets with the same name are shared
+        rate (float): Requests per second
+        burst (int, optional): Requests allowed at once after being idle. Defaults to 1.
+        jitter (float, optional): Maximum random seconds added to each wait. Defaults to 0.
+        path (Optional[str], optional): SQLite file to share the bucket between processes. Defaults to None.
+        max_backoff (float, optional): Maximum slow down after failures. Defaults to 64.
+        recovery (float, optional): Seconds for the slow down to halve without failures. Defaults to 60.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate: float,
+        burst: int = 1,
+        jitter: float = 0,
+        path: Optional[str] = None,
+        max_backoff: float = 64,
+        recovery: float = 60,
+    ) -> None:
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.jitter = jitter
+        self.path = path
+        self.max_backoff = max_backoff
+        self.recovery = recovery
+
+        self._lock = threading.Lock()
+        self._connection = None
+        # tokens, last refill time, backoff
+        self._state = (float(burst), time.time(), 1.0)
+
+    def acquire(self) -> float:
+        """Wait for a token
+
+        Returns:
+            float: Seconds waited
+        """
+        waited = 0.0
+        while True:
+            wait = self._update(take=True)
+            if wait == 0:
+                return waited
+
+            wait += random.uniform(0, self.jitter)
+            logging.debug(f"Rate limit of {self.name}, waiting {wait:.2f}s")
+            time.sleep(wait)
+            waited += wait
+
+    def report_success(self) -> None:
+        self._update(backoff=0.5)
+
+    def report_failure(self) -> None:
+        self._update(backoff=2)
+
+    def _update(self, take: bool = False, backoff: float = 1) -> float:
+        """Refill the bucket, then take a token or change the backoff
+
+        Returns:
+            float: Seconds until a token is available, 0 if it was taken
+        """
+        with self._lock:
+            if self.path is not None:
+                connection = self._connect()
+                with connection:
+                    # Lock the database so other processes wait for this update
+                    connection.execute("BEGIN IMMEDIATE")
+                    state = self._load(connection)
+                    state, wait = self._next_state(state, take, backoff)
+                    connection.execute(
+                        "INSERT OR REPLACE INTO buckets VALUES (?, ?, ?, ?)",
+                        (self.name, *state),
+                    )
+                return wait
+
+            self._state, wait = self._next_state(self._state, take, backoff)
+            return wait
+
+    def _next_state(
+        self, state: Tuple[float, float, float], take: bool, backoff: float
+    ) -> Tuple[Tuple[float, float, float], float]:
+        tokens, updated, current_backoff = state
+        now = time.time()
+        elapsed = max(0.0, now - updated)
+        # The slow down wears off while nothing fails
+        current_backoff = max(1.0, current_backoff * 0.5 ** (elapsed / self.recovery))
+        rate = self.rate / current_backoff
+
+        tokens = min(self.burst, tokens + elapsed * rate)
+        current_backoff = min(self.max_backoff, max(1.0, current_backoff * backoff))
+
+        wait = 0.0
+        if take:
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / rate
+
+        return (tokens, now, current_backoff), wait
+
+    def _load(self, connection: sqlite3.Connection) -> Tuple[float, float, float]:
+        row = connection.execute(
+            "SELECT tokens, updated, backoff FROM buckets WHERE name = ?",
+            (self.name,),
+        ).fetchone()
+        return row if row is not None else (float(self.burst), time.time(), 1.0)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            self._connection = sqlite3.connect(
+                self.path, timeout=30, isolation_level=None, check_same_thread=False
+            )
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                """CREATE TABLE IF NOT EXISTS buckets (
+                    name TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated REAL NOT NULL,
+                    backoff REAL NOT NULL
+                )"""
+            )
+        return self._connection
@@ -0,0 +1,104 @@
+"""Translators by name, imported only when used
+
+Each backend needs its own dependencies (selenium, deepl, translatepy...), so the
+CLI and GUI import just the selected one. Other packages can add translators with
+an entry point in the "srtranslator.translators" group:
+
+    entry_points={
+        "srtranslator.translators": ["my-translator = my_package.module:MyTranslator"]
+    }
+"""
+import importlib
+
+from typing import Dict, List, Type, Union
+
+from .base import Translator
+
+ENTRY_POINT_GROUP = "srtranslator.translators"
+
+BUILTIN_TRANSLATORS = {
+    "deepl-scrap": "srtranslator.translators.deepl_scrap:DeeplTranslator",
+    "deepl-scrap-pool": "srtranslator.translators.deepl_scrap:DeeplTranslatorPool",
+    "translatepy": "srtranslator.translators.translatepy:TranslatePy",
+    "deepl-api": "srtranslator.translators.deepl_api:DeeplApi",
+    "pydeeplx": "srtranslator.translators.pydeeplx:PyDeepLX",
+}
+
+_registered: Dict[str, Union[str, Type[Translator]]] = {}
+
+
+def _entry_points() -> Dict[str, str]:
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        # Python < 3.8
+        try:
+            from importlib_metadata import entry_points
+        except ImportError:
+            return {}
+
+    found = entry_points()
+    if hasattr(found, "select"):
+        found = found.select(group=ENTRY_POINT_GROUP)
+    else:
+        found = found.get(ENTRY_POINT_GROUP, [])
+
+    return {entry_point.name: entry_point.value for entry_point in found}
+
+
+def _targets() -> Dict[str, Union[str, Type[Translator]]]:
+    return {**BUILTIN_TRANSLATORS, **_entry_points(), **_registered}
+
+
+def register_translator(name: str, target: Union[str, Type[Translator]]) -> None:
+    """Add a translator, as a class or as "module:Class" to import it when used
+
+    Args:
+        name (str): Name to choose it, like "deepl-api"
+        target (Union[str, Type[Translator]]): Translator class or its import path
+    """
+    _registered[name] = target
+
+
+def available_translators() -> List[str]:
+    """Names of the built-in, entry point and registered translators"""
+    return list(_targets())
+
+
+def get_translator_class(name: str) -> Type[Translator]:
+    """Import the translator class of a name
+
+    Raises:
+        ValueError: No translator with that name
+        ImportError: A dependency of the translator is not installed
+    """
+    targets = _targets()
+    if name not in targets:
+        raise ValueError(f"Unknown translator {name}. Available: {', '.join(targets)}")
+
+    target = targets[name]
+    if not isinstance(target, str):
+        return target
+
+    module_name, _, class_name = target.partition(":")
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError as e:
+        raise ImportError(
+            f"Translator {name} needs {e.name}, install it to use it"
+        ) from e
+
+    return getattr(module, class_name)
+
+
+def create_translator(name: str, **kwargs) -> Translator:
+    """Import and instantiate a translator by name
+
+    Args:
+        name (str): Translator name, see available_translators()
+        **kwargs: Arguments of the translator
+
+    Returns:
+        Translator: New translator
+    """
+    return get_translator_class(name)(**kwargs)
@@ -2,7 +2,6 @@ import sys
 import logging
 
 from typing import Optional, List
-from fp.fp import FreeProxy
 from selenium import webdriver
 from webdriverdownloader import GeckoDriverDownloader
 from selenium.webdriver.remote.webdriver import WebDriver
@@ -13,38 +12,35 @@ from selenium.common.exceptions import WebDriverException
 from selenium.webdriver import ActionChains, Keys
 from selenium.webdriver.support import expected_conditions as EC
 
+from .. import events
+from .proxy_pool import get_proxy_pool
+
 
 def create_proxy(country_id: Optional[List[str]] = ["US"]) -> Proxy:
     """Creates a new proxy to use with a selenium driver and avoid get banned
 
+    The proxy comes from a pool checked in background, see proxy_pool.ProxyPool
+
     Args:
         country_id (Optional[List[str]], optional): Contry id to create proxy. Defaults to ['US'].
 
     Returns:
         Proxy: Selenium WebDriver proxy
     """
-    i = 0
-    while i < 3:
-        try:
-            logging.info("Getting a new Proxy from https://www.sslproxies.org/")
-            proxy = FreeProxy(country_id=country_id).get()
-            proxy = Proxy(
-                dict(
-                    proxyType=ProxyType.MANUAL,
-                    httpProxy=proxy,
-                    ftpProxy=proxy,
-                    sslProxy=proxy,
-                    noProxy="",
-                )
-            )
-            return proxy
-        except:
-            logging.info("Exception while getting Proxy. Trying again")
-            i += 1
-
-    raise Exception("Unable to get proxy")
-
-
+    logging.info("Getting a new Proxy from the proxy pool")
+    proxy = get_proxy_pool(country_id).get()
+    return Proxy(
+        dict(
+            proxyType=ProxyType.MANUAL,
+            httpProxy=proxy,
+            ftpProxy=proxy,
+            sslProxy=proxy,
+            noProxy="",
+        )
+    )
+
+
+@events.phase("create_driver")
 def create_driver(proxy: Optional[Proxy] = None) -> WebDriver:
     """Creates a new Firefox selenium webdriver. Install geckodriver if not in path
 
@@ -108,17 +104,93 @@ class Text(BaseElement):
 
 
 class TextArea(BaseElement):
-    def write(self, value: str) -> None:
+    # Replace the whole text at once, as a paste would, in a single input event
+    insert_text_script = """
+        const element = arguments[0];
+        const text = arguments[1];
+        element.focus();
+
+        if (element.isContentEditable) {
+            document.execCommand("selectAll", false, null);
+            document.execCommand("insertText", false, text);
+        } else {
+            // Use the native setter so frameworks tracking the value notice the change
+            const prototype = Object.getPrototypeOf(element);
+            Object.getOwnPropertyDescriptor(prototype, "value").set.call(element, text);
+            element.dispatchEvent(new Event("input", { bubbles: true }));
+            element.dispatchEvent(new Event("change", { bubbles: true }));
+        }
+
+        return element.isContentEditable ? element.innerText : element.value;
+    """
+
+    clear_script = """
+        const element = arguments[0];
+        if (element.isContentEditable) {
+            element.textContent = "";
+        } else {
+            element.value = "";
+        }
+
+        return element.isContentEditable ? element.innerText : element.value;
+    """
+
+    @events.phase("input")
+    def write(self, value: str, fast: bool = True) -> None:
+        """Replace the text in the element
+
+        Args:
+            value (str): Text to write
+            fast (bool, optional): Insert the whole text with javascript, typing it only if that fails. Defaults to True.
+        """
         if self.element is None:
             return
 
+        if fast and self._insert(value):
+            return
+
+        self._type(value)
+
+    def clear(self) -> str:
+        """Empty the element without typing in it, like an output field
+
+        Returns:
+            str: Text still in the element, empty if it was cleared
+        """
+        if self.element is None:
+            return ""
+
+        try:
+            return self.driver.execute_script(self.clear_script, self.element) or ""
+        except WebDriverException:
+            logging.info("Unable to clear text with javascript")
+            return self.value or ""
+
+    def _insert(self, value: str) -> bool:
+        try:
+            written = self.driver.execute_script(
+                self.insert_text_script, self.element, value
+            )
+        except WebDriverException:
+            logging.info("Unable to insert text with javascript")
+            return False
+
+        # Editors may render each line as a paragraph, compare non empty lines only
+        lines = lambda text: [line for line in text.splitlines() if line.strip()]
+        if lines(written or "") != lines(value):
+            logging.info("Text inserted with javascript does not match, typing it")
+            return False
+
+        return True
+
+    def _type(self, value: str) -> None:
         # Check OS to use Cmd or Ctrl keys
         cmd_ctrl = Keys.COMMAND if sys.platform == "darwin" else Keys.CONTROL
 
         actions_handler = ActionChains(self.driver).move_to_element(self.element)
         actions_handler.click().key_down(cmd_ctrl).send_keys("a").perform()
         actions_handler.send_keys(Keys.CLEAR).key_up(cmd_ctrl).perform()
-        actions_handler.send_keys(*value).perform()
+        actions_handler.send_keys(*value.replace("\n", Keys.ENTER)).perform()
 
     @property
     def value(self) -> None:
@@ -1,3 +1,5 @@
+import time
+
 from translatepy import Translator
 from translatepy.exceptions import TranslatepyException, UnknownLanguage
 
@@ -6,14 +8,22 @@ from .base import Translator as BaseTranslator
 
 class TranslatePy(BaseTranslator):
     max_char = 1e10
+    max_workers = 4
 
     def __init__(self):
         self.translator = Translator()
 
     def translate(self, text, source_language, destination_language):
-        result = self.translator.translate(
-            text,
-            source_language=source_language,
-            destination_language=destination_language,
-        )
+        start = time.perf_counter()
+        try:
+            result = self.translator.translate(
+                text,
+                source_language=source_language,
+                destination_language=destination_language,
+            )
+        except Exception:
+            self._emit_request(len(text), start, success=False)
+            raise
+
+        self._emit_request(len(text), start)
         return result.result
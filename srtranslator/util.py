@@ -1,4 +1,13 @@
+import os
 import sys
+import glob
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, List, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
 
 
 def show_progress(total: int, progress: int):
@@ -14,3 +23,73 @@ def show_progress(total: int, progress: int):
     )
     sys.stdout.write(text)
     sys.stdout.flush()
+
+
+def ordered_map(
+    func: Callable[[T], R], items: Iterable[T], workers: int = 1
+) -> Iterator[Tuple[T, R]]:
+    """Applies func to every item on a thread pool, yielding results in input order
+
+    At most 2 * workers items are in flight, so a lazy iterable is not consumed
+    far ahead of the results being read.
+
+    Args:
+        func (Callable): Function to apply to each item
+        items (Iterable): Items to process
+        workers (int, optional): Number of threads. Defaults to 1 (no thread pool).
+
+    Yields:
+        Iterator[Tuple[T, R]]: Each item with its result, in the same order as items
+    """
+    if workers <= 1:
+        for item in items:
+            yield item, func(item)
+        return
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for item in items:
+            pending.append((item, executor.submit(func, item)))
+
+            if len(pending) >= 2 * workers:
+                item, future = pending.popleft()
+                yield item, future.result()
+
+        while pending:
+            item, future = pending.popleft()
+            yield item, future.result()
+
+
+def find_subtitle_files(
+    paths: Iterable[str], extensions: Tuple[str, ...] = (".srt", ".ass")
+) -> List[str]:
+    """Expand files, folders (recursively) and glob patterns into subtitle files
+
+    Args:
+        paths (Iterable[str]): Files, folders or glob patterns
+        extensions (Tuple[str, ...], optional): Extensions to look for in folders. Defaults to (".srt", ".ass").
+
+    Returns:
+        List[str]: Subtitle files, without duplicates, in the order found
+    """
+    files = []
+    for path in paths:
+        is_pattern = any(char in path for char in "*?[")
+        matches = glob.glob(path, recursive=True) if is_pattern else [path]
+
+        for match in sorted(matches):
+            if not os.path.isdir(match):
+                files.append(match)
+                continue
+
+            for ext in extensions:
+                files.extend(
+                    sorted(
+                        glob.glob(
+                            os.path.join(glob.escape(match), f"**/*{ext}"),
+                            recursive=True,
+                        )
+                    )
+                )
+
+    return list(dict.fromkeys(files))
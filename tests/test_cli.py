@@ -0,0 +1,25 @@
+import pytest
+
+from srtranslator.cli import parse_args
+
+
+def test_dest_lang_before_path():
+    args = parse_args(["-i", "en", "-o", "es", "file.srt"])
+    assert args.filepath == ["file.srt"]
+    assert args.dest_lang == ["es"]
+
+
+def test_several_values():
+    args = parse_args(
+        ["a.srt", "-o", "es,fr", "-o", "de", "--fallback", "translatepy", "b.srt"]
+    )
+    assert args.filepath == ["a.srt", "b.srt"]
+    assert args.dest_lang == ["es", "fr", "de"]
+    assert args.fallback == ["translatepy"]
+
+
+def test_skip():
+    assert parse_args(["--skip", "symbols,urls", "a.srt"]).skip == ["symbols", "urls"]
+    assert parse_args(["--skip", "none", "a.srt"]).skip == []
+    with pytest.raises(SystemExit):
+        parse_args(["--skip", "lyrics", "a.srt"])
@@ -0,0 +1,59 @@
+import time
+import threading
+
+from srtranslator.translators.base import Translator
+from srtranslator.translators.hedged import HedgedTranslator
+
+
+class Backend(Translator):
+    max_char = 1000
+
+    def __init__(self, latency: float, fail: bool = False, max_workers: int = 1):
+        self.id = f"backend-{latency}-{fail}"
+        self.latency = latency
+        self.fail = fail
+        self.max_workers = max_workers
+
+    def translate(self, text, source_language, destination_language):
+        time.sleep(self.latency)
+        if self.fail:
+            raise RuntimeError(f"{self.id} failed {text}")
+        return text.upper()
+
+
+def translate_at_once(hedged, texts, delay=0.0):
+    results = {}
+
+    def run(text):
+        try:
+            results[text] = hedged.translate(text, "en", "es")
+        except Exception as e:
+            results[text] = e
+
+    threads = []
+    for text in texts:
+        threads.append(threading.Thread(target=run, args=(text,)))
+        threads[-1].start()
+        time.sleep(delay)
+    for thread in threads:
+        thread.join()
+    return [results[text] for text in texts]
+
+
+def test_failover_waits_for_busy_translator():
+    hedged = HedgedTranslator([Backend(0.01, fail=True, max_workers=4), Backend(0.05)])
+    try:
+        assert translate_at_once(hedged, ["a", "b", "c", "d"]) == ["A", "B", "C", "D"]
+    finally:
+        hedged.quit()
+
+
+def test_failover_to_translator_busy_when_hedging():
+    # x goes to the first translator (fails at 0.5s), y to the second one (busy
+    # until 0.3s). x is hedged at 0.1s while the second one is still busy
+    hedged = HedgedTranslator([Backend(0.5, fail=True), Backend(0.3)], hedge_after=0.1)
+    try:
+        assert translate_at_once(hedged, ["x", "y"], delay=0.02) == ["X", "Y"]
+        assert hedged.stats()["2:backend-0.3-False"]["served"] == 2
+    finally:
+        hedged.quit()
@@ -0,0 +1,46 @@
+import time
+import threading
+
+from srtranslator.srt_file import SrtFile
+from srtranslator.translators.base import Translator
+from srtranslator.languages import translate_languages
+
+
+class Counting(Translator):
+    max_char = 100
+    max_workers = 4
+
+    def __init__(self):
+        self.running = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def translate(self, text, source_language, destination_language):
+        with self.lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(0.01)
+        with self.lock:
+            self.running -= 1
+        return text
+
+
+def test_shared_translator_within_max_workers(tmp_path):
+    filepath = tmp_path / "movie.srt"
+    filepath.write_text(
+        "".join(
+            f"{i}\n00:00:{i:02},000 --> 00:00:{i:02},500\nSubtitle number {i}\n\n"
+            for i in range(1, 60)
+        )
+    )
+    translator = Counting()
+    outputs = translate_languages(
+        SrtFile(str(filepath), lambda total, progress: None),
+        translator,
+        "en",
+        ["es", "fr", "de", "it"],
+        workers=4,
+    )
+
+    assert sorted(outputs) == ["de", "es", "fr", "it"]
+    assert translator.peak <= translator.max_workers
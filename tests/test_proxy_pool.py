@@ -0,0 +1,48 @@
+import time
+
+import pytest
+
+pytest.importorskip("fp")
+
+from srtranslator.translators.proxy_pool import ProxyPool
+
+
+class CountingPool(ProxyPool):
+    """Pool scraping the same candidates every time, where only some work"""
+
+    def __init__(self, candidates, working, **kwargs):
+        super().__init__(size=2, check_timeout=0.01, **kwargs)
+        self.candidates = candidates
+        self.working = working
+        self.scrapes = 0
+        self.checked = []
+
+    def _get_candidates(self):
+        self.scrapes += 1
+        return list(self.candidates)
+
+    def _check(self, proxy):
+        self.checked.append(proxy)
+        return 0.1 if proxy in self.working else None
+
+
+def test_failed_candidates_not_checked_again():
+    pool = CountingPool(["http://a", "http://b", "http://c"], {"http://c"})
+    try:
+        assert pool.get(timeout=5) == "http://c"
+        time.sleep(0.2)
+        # a and b failed once, and the pool still wants a second proxy
+        assert sorted(pool.checked) == ["http://a", "http://b", "http://c"]
+    finally:
+        pool.close()
+
+
+def test_scraping_backs_off_when_nothing_works():
+    pool = CountingPool([], set(), max_retry_delay=0.16)
+    try:
+        with pytest.raises(Exception):
+            pool.get(timeout=0.5)
+        # Waits of 0.01, 0.02, 0.04, 0.08, 0.16, 0.16... instead of one every 0.01
+        assert pool.scrapes <= 7
+    finally:
+        pool.close()
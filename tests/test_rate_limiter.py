@@ -0,0 +1,27 @@
+import time
+
+from srtranslator.translators.rate_limiter import RateLimiter
+
+
+def test_backoff_wears_off(tmp_path):
+    path = str(tmp_path / "rate_limits.sqlite3")
+    limiter = RateLimiter("backend", rate=10, path=path, max_backoff=8, recovery=60)
+    for _ in range(5):
+        limiter.report_failure()
+    assert limiter._load(limiter._connect())[2] == 8
+
+    # Two minutes later, in another run
+    state, _ = RateLimiter("backend", rate=10, recovery=60)._next_state(
+        (1.0, time.time() - 120, 8.0), take=False, backoff=1
+    )
+    assert abs(state[2] - 2) < 0.01
+
+
+def test_success_and_failure():
+    limiter = RateLimiter("backend", rate=1000, burst=1)
+    limiter.report_failure()
+    limiter.report_failure()
+    assert abs(limiter._state[2] - 4) < 0.01
+    limiter.report_success()
+    assert abs(limiter._state[2] - 2) < 0.01
+    assert limiter.acquire() == 0